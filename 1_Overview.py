@@ -1,5 +1,7 @@
 import streamlit as st
 
+from bgg.warmup import readiness_indicator, start_warmup
+
 st.set_page_config(
     page_title="Hello",
     page_icon="👋",
@@ -10,6 +12,9 @@ st.sidebar.success('Select a page above.')
 
 st.sidebar.divider()
 
+start_warmup()
+readiness_indicator()
+
 st.write("# Welcome to my Board Games Analysis! 👋")
 
 st.markdown("""I've always had an enjoyment of boardgames, and being a data analyst by trades lead me to considering 
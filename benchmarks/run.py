@@ -0,0 +1,166 @@
+"""Time the data pipeline stages and page scripts against synthetic datasets.
+
+Each dataset size gets a fresh temporary directory holding a board_games.csv
+from bgg.synthetic. The pipeline stages are timed one by one in dependency
+order, each with its inputs already cached, and then every page is run
+headlessly with Streamlit's AppTest, once cold, with every cache cleared and
+the stored aggregates and profile removed so only the snapshot is left, and
+once warm. Results are written as one JSON object per line:
+
+    python -m benchmarks.run --sizes 10000 100000 1000000 --output bench.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import altair as alt  # noqa: E402
+import streamlit as st  # noqa: E402
+from st_aggrid import GridOptionsBuilder  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from bgg import aggregates, data, filters, leaderboards, profile, search, similar, tags, trends  # noqa: E402
+from bgg.data import join_tags  # noqa: E402
+from bgg.charts import slope_chart, strip_plot  # noqa: E402
+from bgg.grid import page_of  # noqa: E402
+from bgg.sections import EXPAND_ALL_KEY  # noqa: E402
+from bgg.synthetic import synthetic_games  # noqa: E402
+from bgg.warmup import ENV_VAR as WARMUP_ENV_VAR  # noqa: E402
+
+PAGES = [ROOT / '1_Overview.py'] + sorted((ROOT / 'pages').glob('*.py'))
+
+# Query the search stages and pages are run with, so that the search pages
+# search rather than render an empty query.
+PAGE_QUERY = 'empire dragon'
+
+# Widget values the pages are run with, by page script.
+PAGE_INPUTS = {
+    '5_Game_Search_🔎.py': {'search_query': PAGE_QUERY},
+    '6_Games_Like_This_🧩.py': {'similar_query': PAGE_QUERY},
+}
+
+# Columns of the long games grid on the data exploration page.
+LONG_GAMES_COLUMNS = ['id', 'name', 'yearpublished', 'playingtime', 'minplaytime', 'maxplaytime', 'categories']
+
+
+def timed(results, size, kind, name, func):
+    start = time.perf_counter()
+    value = func()
+    results.append({'size': size, 'kind': kind, 'name': name, 'seconds': round(time.perf_counter() - start, 6)})
+    return value
+
+
+def bench_stages(results, size):
+    """Time each pipeline stage, in dependency order so earlier stages are cached."""
+    raw = timed(results, size, 'stage', 'csv_parse', lambda: pd.read_csv(data.DATA_PATH, dtype=data.DTYPES))
+    timed(results, size, 'stage', 'mechanics_normalise',
+          lambda: data.split_tags(raw['mechanics'], data.MECHANIC_FIXUPS))
+    timed(results, size, 'stage', 'snapshot_build', data.build_snapshot)
+    games = timed(results, size, 'stage', 'snapshot_load', data.load_games)
+    for family in data.TAG_COLUMNS:
+        timed(results, size, 'stage', f'{family}_incidence', lambda: tags.tag_incidence(family))
+    timed(results, size, 'stage', 'aggregates', aggregates.yearly_aggregates)
+    timed(results, size, 'stage', 'yearly_metrics', aggregates.yearly_metrics)
+    for family in data.TAG_COLUMNS:
+        timed(results, size, 'stage', f'{family}_counts', lambda: aggregates.tag_totals(family, start=1950))
+        timed(results, size, 'stage', f'{family}_per_game',
+              lambda: aggregates.yearly_tags_per_game(family).loc[1950:2023])
+        timed(results, size, 'stage', f'{family}_share', lambda: trends.tag_share_change(family, [2000, 2020]))
+
+    for column in filters.FILTER_COLUMNS:
+        timed(results, size, 'stage', f'{column}_sorted_index', lambda: filters.sorted_index(column))
+    long_games = timed(results, size, 'stage', 'long_games_filter',
+                       lambda: games.iloc[filters.select_all({'playingtime': (1440, None)})])
+    for metric in leaderboards.METRICS:
+        timed(results, size, 'stage', f'{metric}_leaderboard', lambda: leaderboards.leaderboard(metric))
+    timed(results, size, 'stage', 'top_games', lambda: leaderboards.top_games('average_rating', 20, 1990, 2020))
+    timed(results, size, 'stage', 'yearly_top_games',
+          lambda: leaderboards.yearly_top_games('average_rating', 5, 1990, 2020))
+    timed(results, size, 'stage', 'search_index', lambda: search.search_index('name'))
+    timed(results, size, 'stage', 'search_games', lambda: search.search_games(PAGE_QUERY))
+    timed(results, size, 'stage', 'similarity_index', similar.similarity_index)
+    timed(results, size, 'stage', 'similar_games', lambda: similar.similar_games(0))
+
+    rated = games.dropna(subset=['yearpublished'])
+    rated = rated[(rated['yearpublished'] >= 1990) & (rated['users_rated'] >= 150)]
+    rated = rated[['yearpublished', 'average_rating']].astype({'yearpublished': int})
+    with alt.data_transformers.enable('default', max_rows=None):
+        timed(results, size, 'stage', 'chart_strip_plot',
+              lambda: strip_plot(rated, 'average_rating', 'Rating').to_dict())
+        timed(results, size, 'stage', 'chart_slope',
+              lambda: slope_chart(trends.tag_share_change('mechanics', [2000, 2020]), 'mechanics', 'Mechanic')
+              .to_dict())
+        timed(results, size, 'stage', 'chart_bar',
+              lambda: alt.Chart(leaderboards.top_games('total_owners', 50, columns=['name'])).mark_bar()
+              .encode(x='name', y='total_owners').to_dict())
+
+    def aggrid_options():
+        # One page of the displayed columns, as paged_grid hands AgGrid.
+        view = page_of(long_games, 1, 10)[LONG_GAMES_COLUMNS].copy()
+        view['categories'] = join_tags(view['categories'])
+        return GridOptionsBuilder.from_dataframe(view).build()
+    timed(results, size, 'stage', 'aggrid_options', aggrid_options)
+
+
+def clear_caches():
+    """Forget every cached result and stored artifact, short of the snapshot itself."""
+    st.cache_resource.clear()
+    st.cache_data.clear()
+    for path in (aggregates.AGGREGATES_PATH, profile.PROFILE_PATH):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def bench_pages(results, size):
+    """Run every page cold, from a built snapshot but nothing else, and then warm."""
+    # The overview page would otherwise warm the caches behind the cold runs.
+    os.environ[WARMUP_ENV_VAR] = '0'
+    for page in PAGES:
+        for run in ('cold', 'warm'):
+            if run == 'cold':
+                clear_caches()
+            app = AppTest.from_file(str(page), default_timeout=600)
+            # Open every lazy section, so the timings cover the whole page.
+            app.session_state[EXPAND_ALL_KEY] = True
+            for key, value in PAGE_INPUTS.get(page.name, {}).items():
+                app.session_state[key] = value
+            timed(results, size, f'page_{run}', page.stem, app.run)
+            if app.exception:
+                raise RuntimeError(f'{page.name} failed: {app.exception[0].message}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the pages and data pipeline.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--output', help='file to write JSON lines to, instead of stdout')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            synthetic_games(size).to_csv(data.DATA_PATH, index=False)
+            st.cache_resource.clear()
+            st.cache_data.clear()
+            bench_stages(results, size)
+            bench_pages(results, size)
+            os.chdir(ROOT)
+
+    lines = '\n'.join(json.dumps(result, ensure_ascii=False) for result in results) + '\n'
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(lines)
+    else:
+        sys.stdout.write(lines)
+
+
+if __name__ == '__main__':
+    main()
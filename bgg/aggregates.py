@@ -0,0 +1,215 @@
+"""Year-level aggregates that can be updated incrementally.
+
+Every aggregate is a sum over games: yearly release counts, per-year counts of
+each mechanic and category and of the games tagged with any, and the per-year
+sum and count of ratings and weights for games with enough votes (from which
+the means follow). They are kept in one long-form table of (aggregate,
+yearpublished, key, value) rows, so the effect of adding or removing a set of
+games is just the contributions of those games added or subtracted (see
+bgg.refresh). Tag counts are sparse matrix products: a years x games indicator
+matrix times the games' tag incidence matrix (see bgg.tags) gives every year's
+count of every tag at once. The table is built in one pass over the snapshot
+and stored next to it, tagged with the dataset version it describes.
+
+yearly_metrics folds the table into a year-indexed cube of the metrics the
+pages plot, so the pages never touch the individual games for them.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+from scipy import sparse
+
+from bgg.data import TAG_COLUMNS, dataset_version, load_games
+from bgg.filters import select_all
+from bgg.instrument import track_shared
+from bgg.tags import incidence_matrix
+
+AGGREGATES_PATH = 'board_games.aggregates.parquet'
+
+# Games need this many ratings, or weight votes, for their rating or weight to
+# count towards a year's mean.
+MIN_USERS_RATED = 150
+
+COLUMNS = ['id', 'yearpublished', 'users_rated', 'average_rating', 'total_weights', 'average_weight'] + TAG_COLUMNS
+
+# Bumped whenever contributions changes, so stored tables from before are rebuilt.
+FORMAT = 2
+
+
+# Independent slices of the table, each computed from its own columns, so they
+# can be built in parallel (see bgg.precompute).
+PARTS = ['games'] + TAG_COLUMNS
+
+
+def part_columns(part):
+    """Snapshot columns needed to compute one part of the table."""
+    if part in TAG_COLUMNS:
+        return ['yearpublished', part]
+    return ['yearpublished', 'users_rated', 'average_rating', 'total_weights', 'average_weight']
+
+
+def part_contributions(games, part):
+    """Long-form aggregate rows contributed by games to one of PARTS."""
+    known = games[games['yearpublished'].notna()]
+    if part in TAG_COLUMNS:
+        matrix, vocabulary = incidence_matrix(known[part].to_numpy())
+        years, year_rows = np.unique(known['yearpublished'].to_numpy(dtype=int), return_inverse=True)
+        # years x games indicator, so multiplying by it sums games' rows per year.
+        by_year = sparse.csr_matrix((np.ones(len(known), dtype=np.int32), (year_rows, np.arange(len(known)))),
+                                    shape=(len(years), len(known)))
+        counts = (by_year @ matrix).tocoo()
+        tagged = by_year @ (np.diff(matrix.indptr) > 0).astype(np.int32)
+        parts = [
+            pd.DataFrame({'yearpublished': years[counts.row], 'key': vocabulary[counts.col], 'value': counts.data,
+                          'aggregate': part}),
+            pd.DataFrame({'yearpublished': years, 'value': tagged, 'aggregate': f'{part}_games'})[tagged > 0],
+        ]
+    else:
+        rated = known[known['users_rated'] >= MIN_USERS_RATED]
+        weighted = known[known['total_weights'] >= MIN_USERS_RATED]
+        parts = [
+            known.groupby('yearpublished').size().rename('value').reset_index().assign(aggregate='releases'),
+            rated.groupby('yearpublished').size().rename('value').reset_index().assign(aggregate='rating_count'),
+            rated.groupby('yearpublished')['average_rating'].sum().rename('value').reset_index()
+            .assign(aggregate='rating_sum'),
+            weighted.groupby('yearpublished').size().rename('value').reset_index().assign(aggregate='weight_count'),
+            weighted.groupby('yearpublished')['average_weight'].sum().rename('value').reset_index()
+            .assign(aggregate='weight_sum'),
+        ]
+    frame = pd.concat(parts, ignore_index=True)
+    if 'key' not in frame:
+        frame['key'] = ''
+    frame['key'] = frame['key'].fillna('').astype(str)
+    frame['yearpublished'] = frame['yearpublished'].astype(int)
+    frame['value'] = frame['value'].astype(float)
+    return frame[['aggregate', 'yearpublished', 'key', 'value']]
+
+
+def contributions(games, sign=1):
+    """Long-form aggregate rows contributed by games, multiplied by sign."""
+    frame = pd.concat([part_contributions(games, part) for part in PARTS], ignore_index=True)
+    frame['value'] *= sign
+    return frame
+
+
+def combine(*frames):
+    """Sum aggregate tables, dropping entries that cancel out to zero."""
+    frame = pd.concat(frames, ignore_index=True)
+    frame = frame.groupby(['aggregate', 'yearpublished', 'key'], as_index=False)['value'].sum()
+    return frame[frame['value'].abs() > 1e-9].reset_index(drop=True)
+
+
+def write_aggregates(frame, version, path=AGGREGATES_PATH):
+    """Store an aggregate table, tagged with the dataset version it describes."""
+    table = pa.Table.from_pandas(frame, preserve_index=False)
+    table = table.replace_schema_metadata({b'dataset_version': json.dumps(list(version)).encode(),
+                                           b'format': str(FORMAT).encode()})
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def read_aggregates(version, path=AGGREGATES_PATH):
+    """Load the stored aggregates, or None if missing or for another version."""
+    if not os.path.exists(path):
+        return None
+    table = pq.read_table(path)
+    metadata = table.schema.metadata or {}
+    stored = json.loads(metadata.get(b'dataset_version', b'null'))
+    if stored != list(version) or metadata.get(b'format') != str(FORMAT).encode():
+        return None
+    return table.to_pandas()
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_aggregates(version):
+    frame = read_aggregates(version)
+    if frame is None:
+        frame = combine(contributions(load_games(COLUMNS)))
+        write_aggregates(frame, version)
+    return track_shared(f'yearly aggregates {version}', frame)
+
+
+def yearly_aggregates():
+    """The (aggregate, yearpublished, key, value) table for the current dataset.
+
+    The frame is shared between sessions and must not be modified.
+    """
+    return _load_aggregates(dataset_version())
+
+
+def _aggregate(name):
+    frame = yearly_aggregates()
+    return frame[frame['aggregate'] == name]
+
+
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _build_yearly_metrics(version):
+    frame = yearly_aggregates()
+    totals = frame.groupby(['yearpublished', 'aggregate'])['value'].sum().unstack()
+    totals = totals.reindex(columns=['releases', 'rating_sum', 'rating_count', 'weight_sum', 'weight_count']
+                            + TAG_COLUMNS + [f'{family}_games' for family in TAG_COLUMNS])
+    metrics = pd.DataFrame({
+        'releases': totals['releases'].fillna(0).astype(int),
+        'average_rating': totals['rating_sum'] / totals['rating_count'],
+        'average_weight': totals['weight_sum'] / totals['weight_count'],
+    })
+    for family in TAG_COLUMNS:
+        # Each family aggregate's keys sum to the (game, tag) pairs released that year.
+        metrics[f'{family}_per_game'] = totals[family] / totals[f'{family}_games']
+    return track_shared(f'yearly metrics {version}', metrics.sort_index())
+
+
+def yearly_metrics():
+    """Year-indexed cube of releases, mean rating, mean weight and tags per game.
+
+    The frame is shared between sessions and must not be modified.
+    """
+    return _build_yearly_metrics(dataset_version())
+
+
+def yearly_releases():
+    """Number of games released each year, for games with a known year."""
+    return yearly_metrics()['releases'].rename('count')
+
+
+def yearly_rating_means():
+    """Mean rating of the games with at least MIN_USERS_RATED ratings, per year."""
+    return yearly_metrics()['average_rating'].dropna()
+
+
+def yearly_weight_means():
+    """Mean weight of the games with at least MIN_USERS_RATED weight votes, per year."""
+    return yearly_metrics()['average_weight'].dropna()
+
+
+def yearly_tags_per_game(family):
+    """Average number of tags per tagged game, for each release year."""
+    return yearly_metrics()[f'{family}_per_game'].dropna().rename(family)
+
+
+def voted_games(value, votes, start=None, min_votes=MIN_USERS_RATED):
+    """Games with a known year, released from start on, with at least min_votes votes towards value."""
+    positions = select_all({'yearpublished': (start, None), votes: (min_votes, None)})
+    # One copy of just the selected rows, rather than one per filtering step.
+    games = load_games(['yearpublished', value, votes, 'name']).iloc[positions]
+    return games.astype({'yearpublished': int})
+
+
+def yearly_tag_counts(family):
+    """Year x tag table of how many games released that year use each tag."""
+    counts = _aggregate(family).pivot(index='yearpublished', columns='key', values='value')
+    counts = counts.reindex(yearly_releases().index).fillna(0).astype(int)
+    return counts.rename_axis(index='yearpublished', columns=None)
+
+
+def tag_totals(family, start=None, end=None):
+    """Number of games using each tag, released between start and end inclusive."""
+    counts = yearly_tag_counts(family).loc[start:end].sum()
+    counts = counts[counts > 0].sort_values(ascending=False, kind='stable')
+    return counts.rename_axis(family).reset_index(name='Count')
@@ -0,0 +1,153 @@
+"""Chart builders shared by the pages, and a cache of their Vega-Lite specs.
+
+Building an Altair chart and serialising its data is repeated on every rerun
+even though the inputs only change with the dataset. show_chart keeps the
+finished Vega-Lite JSON per chart key, chart parameters and dataset version,
+shared by every session, and drops all of it when the dataset changes.
+"""
+import json
+import threading
+
+import altair as alt
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bgg.aggregates import MIN_USERS_RATED, voted_games, yearly_metrics
+from bgg.data import dataset_version
+from bgg.instrument import stage
+
+# Points kept per year when the strip plots are downsampled.
+STRIP_PLOT_SAMPLE = 300
+
+# First release year the strip plots show by default.
+STRIP_PLOT_START = 1990
+
+_spec_lock = threading.Lock()
+_spec_version = None
+
+
+@st.cache_resource(max_entries=64, show_spinner=False)
+def _build_chart_spec(key, params, version, _build):
+    with alt.data_transformers.enable('default', max_rows=None):
+        return json.dumps(_build().to_dict())
+
+
+def clear_chart_cache():
+    """Forget every cached chart spec."""
+    _build_chart_spec.clear()
+
+
+def chart_spec(key, build, params=()):
+    """Vega-Lite spec of the chart returned by build(), memoised per dataset version.
+
+    key names the chart and params must hold every setting the chart depends on
+    other than the dataset itself; build is only called on a cache miss.
+    """
+    global _spec_version
+    version = dataset_version()
+    with _spec_lock:
+        if version != _spec_version:
+            clear_chart_cache()
+            _spec_version = version
+    return json.loads(_build_chart_spec(key, tuple(params), version, build))
+
+
+def show_chart(key, build, params=(), width='content'):
+    """Render a chart through the spec cache, see chart_spec; width is 'content', 'stretch' or pixels."""
+    with stage(f'chart {key}'):
+        st.vega_lite_chart(chart_spec(key, build, params), width=width)
+
+
+def strip_plot_data(data, value, max_per_year=None, seed=0, means=None):
+    """Minimal data for a yearly strip plot, with jitter and means precomputed.
+
+    Each game becomes a (yearpublished, value, jitter) row, optionally capped
+    at max_per_year randomly chosen games per year. The per-year means are
+    always taken over every game, or given as a year-indexed Series in means,
+    and appended as rows without a jitter.
+    """
+    points = data[['yearpublished', value]]
+    if max_per_year is not None:
+        points = points.sample(frac=1, random_state=seed).groupby('yearpublished').head(max_per_year)
+    rng = np.random.default_rng(seed)
+    points = points.assign(jitter=rng.standard_normal(len(points)).round(3))
+    if means is None:
+        means = data.groupby('yearpublished')[value].mean()
+    means = means.rename(value).rename_axis('yearpublished').reset_index()
+    return pd.concat([points, means], ignore_index=True)
+
+
+def strip_plot(data, value, title, max_per_year=None, seed=0, means=None):
+    """Faceted strip plot of value per release year, with each year's mean marked."""
+    base = alt.Chart().encode(
+        y=alt.Y(f'{value}:Q', title=title),
+    )
+    stripplot = base.mark_circle(size=8).encode(
+        x=alt.X(
+            'jitter:Q',
+            title=None,
+            axis=alt.Axis(ticks=True, grid=False, labels=False),
+            scale=alt.Scale(),
+        ),
+        color=alt.Color('yearpublished:N', legend=None),
+    ).transform_filter('isValid(datum.jitter)')
+    meanplot = base.mark_point(size=30).encode(
+        color=alt.value('#ffff99'),
+    ).transform_filter('!isValid(datum.jitter)')
+    return alt.layer(
+        stripplot, meanplot, data=strip_plot_data(data, value, max_per_year, seed, means),
+    ).properties(
+        width=27,
+    ).facet(
+        column=alt.Column(
+            'yearpublished', title=None,
+            header=alt.Header(
+                labelColor='white',
+                labelFontSize=12,
+                labelAngle=0,
+                titleOrient='top',
+                labelOrient='bottom',
+                labelAlign='center',
+                labelPadding=25,
+            ),
+        ),
+    ).configure_facet(
+        spacing=5
+    ).configure_view(
+        stroke=None
+    )
+
+
+def yearly_strip_plot(value, votes, title, max_per_year=None, start=STRIP_PLOT_START, min_votes=MIN_USERS_RATED):
+    """Strip plot of value per year for the games with at least min_votes votes.
+
+    The yearly means come from the metrics cube when it holds them, that is
+    for the default MIN_USERS_RATED votes.
+    """
+    means = yearly_metrics()[value].dropna().loc[start:] if min_votes == MIN_USERS_RATED else None
+    return strip_plot(voted_games(value, votes, start, min_votes), value, title, max_per_year, means=means)
+
+
+def slope_chart(data, family, title):
+    """Slope chart of each tag's share of releases between two periods.
+
+    data is the long-form (tag, year, percent) frame from trends.tag_share_change.
+    """
+    domain = list(data['year'].unique())
+    colors = ['skyblue', 'mediumorchid']
+
+    lines = alt.Chart(data).mark_line(point=True).encode(
+        x='percent',
+        y=family,
+        detail=family,
+        color=alt.value('lightskyblue'),
+    )
+
+    points = alt.Chart(data).mark_circle(size=100).encode(
+        x=alt.X('percent', title='Percentage Usage'),
+        y=alt.Y(family, title=title),
+        color=alt.Color('year', scale=alt.Scale(domain=domain, range=colors))
+    )
+
+    return lines + points
@@ -0,0 +1,221 @@
+"""Shared access to the BGG dataset used by every page.
+
+The scraped board_games.csv is converted once into a typed Parquet snapshot
+(nullable integer release year, list-encoded mechanics and categories) which
+pages then read column-selectively. Run ``python -m bgg.data`` to build the
+snapshot ahead of time; otherwise it is rebuilt on first use whenever the CSV
+is newer than the snapshot. The CSV is converted BATCH_ROWS rows at a time, so
+building the snapshot never holds more than one batch of the scrape in memory.
+"""
+import os
+import threading
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import streamlit as st
+
+from bgg.instrument import track_shared
+
+DATA_PATH = 'board_games.csv'
+SNAPSHOT_PATH = 'board_games.parquet'
+
+# yearpublished is read as text because the scrape uses the literal 'unknown'
+# for games without a release year; the snapshot stores it as a nullable int.
+DTYPES = {
+    'id': 'int64',
+    'name': 'object',
+    'yearpublished': 'object',
+    'minplayers': 'int64',
+    'maxplayers': 'int64',
+    'playingtime': 'int64',
+    'minplaytime': 'int64',
+    'maxplaytime': 'int64',
+    'users_rated': 'int64',
+    'average_rating': 'float64',
+    'total_owners': 'int64',
+    'total_weights': 'int64',
+    'average_weight': 'float64',
+    'categories': 'object',
+    'mechanics': 'object',
+    'designer': 'object',
+}
+
+# BGG mechanic names that themselves contain commas, which would otherwise be
+# split apart when the comma separated mechanics column is parsed.
+MECHANIC_FIXUPS = {
+    'Deck, Bag, and Pool Building': 'Deck / Bag / Pool Building',
+    'Worker Placement, Different Worker Types': 'Worker Placement / Different Worker Types',
+    'I Cut, You Choose': 'I Cut / You Choose',
+}
+
+TAG_COLUMNS = ['mechanics', 'categories']
+
+# Rows of the CSV parsed and written to the snapshot at a time.
+BATCH_ROWS = 50_000
+
+# Held while checking whether the snapshot is stale and rebuilding it, so
+# sessions arriving during a rebuild wait for it rather than start their own.
+_snapshot_lock = threading.Lock()
+
+# Narrower types the snapshot stores the columns as, which hold every value BGG
+# uses while keeping the shared frames small. Ratings and weights stay float64
+# so that displayed values and yearly means match the scrape exactly, and names
+# are nearly all distinct so they stay strings rather than categoricals.
+SNAPSHOT_DTYPES = {
+    'id': 'int32',
+    'yearpublished': 'Int16',
+    'minplayers': 'int16',
+    'maxplayers': 'int16',
+    'playingtime': 'int32',
+    'minplaytime': 'int32',
+    'maxplaytime': 'int32',
+    'users_rated': 'int32',
+    'total_owners': 'int32',
+    'total_weights': 'int32',
+    'designer': 'category',
+}
+
+
+def dataset_version(csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Identify the current contents of the dataset by the snapshot's mtime and size.
+
+    The snapshot is rebuilt first if the CSV has changed since, so both a new
+    CSV and an in-place update of the snapshot (see bgg.refresh) produce a new
+    version.
+    """
+    ensure_snapshot(csv_path, snapshot_path)
+    return snapshot_version(snapshot_path)
+
+
+def snapshot_version(snapshot_path=SNAPSHOT_PATH):
+    """The mtime and size of the snapshot as it is, see dataset_version."""
+    stat = os.stat(snapshot_path)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def split_tags(values, fixups=None):
+    """Split a comma separated tag column into lists, leaving nulls as None."""
+    for old, new in (fixups or {}).items():
+        values = values.str.replace(old, new, regex=False)
+    return [tags.split(',') if isinstance(tags, str) else None for tags in values]
+
+
+def join_tags(values):
+    """Turn list-encoded tags back into comma separated text for display."""
+    return [','.join(tags) if tags is not None else None for tags in values]
+
+
+def parse_games(df):
+    """Convert rows read with DTYPES into the typed layout stored in the snapshot, in place."""
+    df['yearpublished'] = pd.to_numeric(df['yearpublished'], errors='coerce').astype('Int64')
+    df['mechanics'] = split_tags(df['mechanics'], MECHANIC_FIXUPS)
+    df['categories'] = split_tags(df['categories'])
+    return df
+
+
+def read_csv(csv_path=DATA_PATH):
+    """Parse the raw scrape into the typed layout stored in the snapshot."""
+    return parse_games(pd.read_csv(csv_path, dtype=DTYPES))
+
+
+def read_csv_batches(csv_path=DATA_PATH, batch_rows=BATCH_ROWS):
+    """Parse the raw scrape batch_rows rows at a time, yielding frames as read_csv returns them."""
+    with pd.read_csv(csv_path, dtype=DTYPES, chunksize=batch_rows) as reader:
+        for batch in reader:
+            yield parse_games(batch)
+
+
+def compact(df):
+    """df with its columns converted to the SNAPSHOT_DTYPES storage types."""
+    return df.astype({column: dtype for column, dtype in SNAPSHOT_DTYPES.items() if column in df})
+
+
+def temp_path(path):
+    """A temporary file name next to path, unique to the calling process and thread."""
+    return f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+
+
+def write_snapshot(df, snapshot_path=SNAPSHOT_PATH):
+    """Atomically replace the snapshot with df, stored as SNAPSHOT_DTYPES."""
+    tmp_path = temp_path(snapshot_path)
+    compact(df).to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def _batch_schema(df):
+    # Fixed across batches, whatever values a single batch happens to hold.
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    fixed = {'name': pa.string(), 'designer': pa.dictionary(pa.int32(), pa.string())}
+    fixed.update({column: pa.list_(pa.string()) for column in TAG_COLUMNS})
+    for column, kind in fixed.items():
+        schema = schema.set(schema.get_field_index(column), pa.field(column, kind))
+    return schema
+
+
+def write_snapshot_batches(batches, snapshot_path=SNAPSHOT_PATH):
+    """Atomically replace the snapshot with the concatenated frames in batches, one row group each."""
+    tmp_path = temp_path(snapshot_path)
+    writer = None
+    try:
+        for batch in batches:
+            batch = compact(batch)
+            if writer is None:
+                schema = _batch_schema(batch)
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(pa.Table.from_pandas(batch, schema=schema, preserve_index=False))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, snapshot_path)
+    return snapshot_path
+
+
+def build_snapshot(csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH, batch_rows=BATCH_ROWS):
+    """Convert the CSV into the Parquet snapshot, replacing any existing one."""
+    return write_snapshot_batches(read_csv_batches(csv_path, batch_rows), snapshot_path)
+
+
+def ensure_snapshot(csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Build the snapshot if it is missing or older than the CSV."""
+    if not os.path.exists(csv_path) or not _snapshot_stale(csv_path, snapshot_path):
+        return snapshot_path
+    with _snapshot_lock:
+        # Another thread may have rebuilt it while this one waited.
+        if _snapshot_stale(csv_path, snapshot_path):
+            build_snapshot(csv_path, snapshot_path)
+    return snapshot_path
+
+
+def _snapshot_stale(csv_path, snapshot_path):
+    return (not os.path.exists(snapshot_path)
+            or os.stat(snapshot_path).st_mtime_ns < os.stat(csv_path).st_mtime_ns)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _snapshot_columns(snapshot_path, version):
+    return pq.read_schema(snapshot_path).names
+
+
+@st.cache_resource(max_entries=64, show_spinner='Loading board games...')
+def _read_column(snapshot_path, version, column):
+    table = pq.read_table(snapshot_path, columns=[column], memory_map=True)
+    return track_shared(f'games {version} {column}', table.to_pandas()[column])
+
+
+def load_games(columns=None, csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH):
+    """Return the dataset, or just the requested columns of it.
+
+    Each column is read once per process and per version of the dataset, and
+    every frame returned shares those columns rather than copying them. The
+    columns are shared between every session, so callers must treat the frame
+    as read-only and take a .copy() of any slice they want to modify.
+    """
+    version = dataset_version(csv_path, snapshot_path)
+    columns = list(columns) if columns else _snapshot_columns(snapshot_path, version)
+    return pd.concat([_read_column(snapshot_path, version, column) for column in columns], axis=1)
+
+
+if __name__ == '__main__':
+    print(f'Wrote {build_snapshot()}')
@@ -0,0 +1,201 @@
+"""Export the analysis pages as a static site.
+
+Each page script is run once, headlessly through Streamlit's AppTest, and
+the elements it rendered are written out as plain HTML: markdown is rendered
+up front, tables become HTML tables and every chart is embedded as its
+finished Vega-Lite spec with its data inlined, drawn in the browser by
+vega-embed. The result can be served by any static file server:
+
+    python -m bgg.export --output site
+
+The search pages, which are empty until a visitor types into them, are left
+out. Every lazy section is opened, widgets are rendered with their default values
+and grids with every row, as one table.
+"""
+import argparse
+import html
+import itertools
+import json
+import os
+import re
+from pathlib import Path
+from urllib.parse import unquote
+
+import altair as alt
+import pyarrow as pa
+from markdown_it import MarkdownIt
+from streamlit.source_util import page_icon_and_name
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Block
+
+from bgg.grid import ALL_ROWS_KEY
+from bgg.sections import EXPAND_ALL_KEY
+from bgg.warmup import ENV_VAR as WARMUP_ENV_VAR
+
+ROOT = Path(__file__).resolve().parents[1]
+# Pages that only show anything once a visitor types into them.
+INTERACTIVE_PAGES = ['5_Game_Search_🔎.py', '6_Games_Like_This_🧩.py']
+PAGES = [ROOT / '1_Overview.py'] + sorted(page for page in (ROOT / 'pages').glob('*.py')
+                                          if page.name not in INTERACTIVE_PAGES)
+
+SCRIPTS = [
+    f'https://cdn.jsdelivr.net/npm/vega@{alt.VEGA_VERSION}',
+    f'https://cdn.jsdelivr.net/npm/vega-lite@{alt.VEGALITE_VERSION}',
+    f'https://cdn.jsdelivr.net/npm/vega-embed@{alt.VEGAEMBED_VERSION}',
+]
+
+TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{scripts}
+<style>
+body {{ margin: 0; display: flex; background: #0e1117; color: #fafafa; font-family: sans-serif; line-height: 1.6; }}
+nav {{ flex: 0 0 16rem; padding: 2rem 1rem; background: #262730; min-height: 100vh; }}
+nav a {{ display: block; padding: 0.3rem 0.5rem; color: #fafafa; text-decoration: none; border-radius: 0.3rem; }}
+nav a.current {{ background: #0e1117; }}
+main {{ flex: 1; min-width: 0; padding: 2rem 3rem; }}
+main a {{ color: #8ab4f8; }}
+.caption {{ color: #a3a8b8; font-size: 0.875rem; }}
+.table {{ overflow-x: auto; }}
+table {{ border-collapse: collapse; font-size: 0.875rem; }}
+th, td {{ border: 1px solid #3d3f4a; padding: 0.2rem 0.6rem; text-align: left; }}
+</style>
+</head>
+<body>
+<nav>
+{nav}
+</nav>
+<main>
+{body}
+</main>
+</body>
+</html>
+"""
+
+_markdown = MarkdownIt('commonmark').enable('table').enable('strikethrough')
+
+# Links to another page of the app, by its URL path, with an optional anchor.
+_PAGE_LINK = re.compile(r'href="/([^"#]*)(#[^"]*)?"')
+
+
+def page_label(page):
+    """Sidebar label of a page script, as Streamlit shows it."""
+    return re.sub(r'^\d+_', '', page.stem).replace('_', ' ')
+
+
+def page_filename(page, index):
+    if index == 0:
+        return 'index.html'
+    slug = re.sub(r'[^0-9a-z]+', '-', page_label(page).lower()).strip('-')
+    return f'{slug}.html'
+
+
+def page_url_path(page, index):
+    """Path of a page script in the running app, as Streamlit derives it from the file name."""
+    return '' if index == 0 else page_icon_and_name(page)[1]
+
+
+def _rewrite_links(body, filenames):
+    """Point links to the app's pages, by {url path: file name}, at the exported files."""
+    def replace(match):
+        path = unquote(match.group(1)).strip('/')
+        if path not in filenames:
+            return match.group(0)
+        return f'href="{filenames[path]}{match.group(2) or ""}"'
+    return _PAGE_LINK.sub(replace, body)
+
+
+def _anchor(text):
+    return re.sub(r'[^0-9a-z]+', '-', text.lower()).strip('-')
+
+
+def _arrow_frame(data):
+    return pa.ipc.open_stream(data).read_all().to_pandas()
+
+
+def _table(frame, index=True):
+    return f'<div class="table">{frame.to_html(index=index, border=0, na_rep="")}</div>'
+
+
+def _dataframe(element):
+    # hide_index is kept in the column config, under Streamlit's name for the index.
+    hidden = json.loads(element.proto.columns or '{}').get('_index', {}).get('hidden', False)
+    return _table(element.value, index=not hidden)
+
+
+def _chart(proto, number):
+    spec = json.loads(proto.spec)
+    if proto.datasets:
+        spec['datasets'] = {dataset.name: json.loads(_arrow_frame(dataset.data.data).to_json(orient='records'))
+                            for dataset in proto.datasets}
+    spec = json.dumps(spec).replace('</', '<\\/')
+    return (f'<div id="chart-{number}"></div>\n'
+            f'<script>vegaEmbed("#chart-{number}", {spec}, {{theme: "dark", actions: false}});</script>')
+
+
+def _grid(proto):
+    data = next(arg for arg in proto.special_args if arg.key == 'data')
+    frame = _arrow_frame(data.arrow_dataframe.data.data)
+    return _table(frame.drop(columns=['::auto_unique_id::'], errors='ignore'), index=False)
+
+
+def render_elements(node, chart_numbers):
+    """HTML for the elements under node, in the order the page rendered them."""
+    parts = []
+    for element in node.children.values():
+        kind = getattr(element, 'type', None)
+        if isinstance(element, Block):
+            parts += render_elements(element, chart_numbers)
+        elif kind in ('title', 'header', 'subheader'):
+            tag = {'title': 'h1', 'header': 'h2', 'subheader': 'h3'}[kind]
+            parts.append(f'<{tag} id="{_anchor(element.value)}">{html.escape(element.value)}</{tag}>')
+        elif kind == 'markdown':
+            parts.append(_markdown.render(element.value))
+        elif kind == 'caption':
+            parts.append(f'<div class="caption">{_markdown.render(element.value)}</div>')
+        elif kind == 'text':
+            parts.append(f'<pre>{html.escape(element.value)}</pre>')
+        elif kind == 'dataframe':
+            parts.append(_dataframe(element))
+        elif kind == 'vega_lite_chart':
+            parts.append(_chart(element.proto, next(chart_numbers)))
+        elif kind == 'component_instance' and element.proto.component_name.startswith('st_aggrid'):
+            parts.append(_grid(element.proto))
+    return parts
+
+
+def export_site(output):
+    """Run every page once and write it to output as a static HTML file."""
+    os.makedirs(output, exist_ok=True)
+    # Rendering the overview page must not start warming caches or write static/ready.json.
+    os.environ[WARMUP_ENV_VAR] = '0'
+    nav_items = [(page_label(page), page_filename(page, i)) for i, page in enumerate(PAGES)]
+    filenames = {page_url_path(page, i): page_filename(page, i) for i, page in enumerate(PAGES)}
+    scripts = '\n'.join(f'<script src="{src}"></script>' for src in SCRIPTS)
+    for i, page in enumerate(PAGES):
+        app = AppTest.from_file(str(page), default_timeout=600)
+        app.session_state[EXPAND_ALL_KEY] = True
+        app.session_state[ALL_ROWS_KEY] = True
+        app.run()
+        if app.exception:
+            raise RuntimeError(f'{page.name} failed: {app.exception[0].message}')
+        nav = '\n'.join(f'<a href="{href}"{" class=current" if j == i else ""}>{html.escape(label)}</a>'
+                        for j, (label, href) in enumerate(nav_items))
+        body = _rewrite_links('\n'.join(render_elements(app.main, itertools.count(1))), filenames)
+        with open(os.path.join(output, nav_items[i][1]), 'w', encoding='utf-8') as f:
+            f.write(TEMPLATE.format(title=html.escape(nav_items[i][0]), scripts=scripts, nav=nav, body=body))
+    return [href for _, href in nav_items]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Export the analysis pages as a static site.')
+    parser.add_argument('--output', default='site', help='directory to write the HTML files to')
+    args = parser.parse_args()
+    files = export_site(args.output)
+    print(f'Wrote {len(files)} pages to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
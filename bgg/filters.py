@@ -0,0 +1,68 @@
+"""Sorted column indexes, so that threshold filters are instant.
+
+Each filterable column is sorted once per dataset version into the known
+values in ascending order alongside the row positions they came from. A
+range filter is then two binary searches into the sorted values, giving the
+positions of the matching games in any load_games() frame without scanning
+the column or running a pandas pipeline, which is what lets the sidebar
+threshold controls update the pages as they are moved.
+"""
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+
+from bgg.data import dataset_version, load_games
+
+# values holds a column's known values in ascending order and positions the
+# row of each value in the frames returned by load_games.
+SortedIndex = namedtuple('SortedIndex', ['values', 'positions'])
+
+# Columns the pages filter on.
+FILTER_COLUMNS = ['yearpublished', 'users_rated', 'total_weights', 'playingtime', 'maxplayers']
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_sorted_index(column, version):
+    values = load_games([column])[column]
+    positions = np.flatnonzero(values.notna().to_numpy())
+    known = values.to_numpy(dtype='float64', na_value=np.nan)[positions]
+    order = np.argsort(known, kind='stable')
+    return SortedIndex(known[order], positions[order])
+
+
+def sorted_index(column):
+    """Return the SortedIndex of column.
+
+    The arrays are shared between sessions and must not be modified.
+    """
+    return _build_sorted_index(column, dataset_version())
+
+
+def select(column, low=None, high=None):
+    """Row positions of the games whose column is known and within [low, high]."""
+    index = sorted_index(column)
+    start = 0 if low is None else np.searchsorted(index.values, low, side='left')
+    end = len(index.values) if high is None else np.searchsorted(index.values, high, side='right')
+    return index.positions[start:end]
+
+
+def select_all(ranges):
+    """Ascending row positions of the games within every {column: (low, high)} range."""
+    positions = None
+    for column, (low, high) in ranges.items():
+        found = select(column, low, high)
+        positions = np.sort(found) if positions is None else np.intersect1d(positions, found, assume_unique=True)
+    return positions
+
+
+def column_range(column):
+    """The smallest and largest known value of column, as ints."""
+    values = sorted_index(column).values
+    return int(values[0]), int(values[-1])
+
+
+def year_slider(label, default, help=None):
+    """Sidebar slider over the known release years, starting at default where it can."""
+    first, last = column_range('yearpublished')
+    return st.sidebar.slider(label, first, last, min(max(default, first), last), help=help)
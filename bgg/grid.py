@@ -0,0 +1,73 @@
+"""AgGrid tables that are paged, sorted and filtered on the server.
+
+Handing a whole frame to AgGrid serialises every row to the browser even when
+only one page of it is visible. paged_grid keeps the filtering, sorting and
+paging in Python and sends AgGrid just the visible page of the displayed
+columns.
+"""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from st_aggrid import GridOptionsBuilder, AgGrid, ColumnsAutoSizeMode
+
+from bgg.data import TAG_COLUMNS, join_tags
+from bgg.instrument import stage
+
+# Session state key that shows every row of every grid on one page, for
+# rendering whole tables headlessly (see bgg.export).
+ALL_ROWS_KEY = 'bgg_grid_all_rows'
+
+
+def page_of(data, page, page_size, sort_by=None, ascending=True):
+    """Rows on the 1-based page of data, ordered by sort_by if given."""
+    start = (page - 1) * page_size
+    if sort_by is None:
+        return data.iloc[start:start + page_size]
+    values = data[sort_by]
+    if sort_by in TAG_COLUMNS:
+        # Lists of tags cannot be compared, so they are ordered by their text.
+        values = pd.Series(join_tags(values))
+    order = values.reset_index(drop=True).sort_values(ascending=ascending, kind='stable').index
+    return data.iloc[order[start:start + page_size]]
+
+
+def paged_grid(data, key, columns=None, page_size=10, search_columns=('name',),
+               columns_auto_size_mode=ColumnsAutoSizeMode.FIT_CONTENTS):
+    """Show data in an AgGrid one page at a time, with filter, sort and page controls."""
+    columns = list(columns if columns is not None else data.columns)
+    search_col, sort_col, order_col, page_col = st.columns([3, 2, 1, 1])
+
+    search = search_col.text_input('Filter by name', key=f'{key}_search')
+    if search:
+        matches = np.zeros(len(data), dtype=bool)
+        for column in search_columns:
+            matches |= data[column].str.contains(search, case=False, regex=False, na=False).to_numpy()
+        data = data[matches]
+
+    sort_by = sort_col.selectbox('Sort by', columns, index=None, key=f'{key}_sort')
+    ascending = order_col.toggle('Ascending', value=True, key=f'{key}_ascending')
+    all_rows = st.session_state.get(ALL_ROWS_KEY, False)
+    if all_rows:
+        page_size = max(len(data), 1)
+    pages = max(1, -(-len(data) // page_size))
+    page = min(page_col.number_input('Page', min_value=1, value=1, key=f'{key}_page'), pages)
+
+    with stage(f'grid {key}') as record:
+        view = page_of(data, page, page_size, sort_by, ascending)[columns].copy()
+        for column in TAG_COLUMNS:
+            if column in view:
+                view[column] = join_tags(view[column])
+
+        gb = GridOptionsBuilder.from_dataframe(view)
+        gb.configure_grid_options(domLayout='autoHeight')
+        # The grid only holds one page, so sorting and grouping in the browser
+        # would only act on that page; the controls above do it for every row.
+        gb.configure_default_column(sortable=False, filter=False, groupable=False, enableRowGroup=False,
+                                    editable=False, suppressMenu=True)
+        gridOptions = gb.build()
+        AgGrid(view, gridOptions=gridOptions, columns_auto_size_mode=columns_auto_size_mode,
+               allow_unsafe_jscode=True, key=key)
+        record['rows'] = len(data)
+    if not all_rows:
+        st.caption(f'Page {page} of {pages}, {len(data)} rows')
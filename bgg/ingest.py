@@ -0,0 +1,48 @@
+"""Build the snapshot and the yearly aggregates in one bounded-memory pass.
+
+The CSV is read BATCH_ROWS rows at a time. Each batch is parsed, appended to
+the new snapshot as a row group and folded into the running aggregate table
+(see bgg.aggregates), which only grows with the number of years and tags, so
+peak memory depends on the batch size rather than on the size of the scrape:
+
+    python -m bgg.ingest full_dump.csv --batch-rows 20000
+
+Both files are replaced together, so the pages pick up the new dataset with
+its aggregates already built.
+"""
+import argparse
+import time
+
+from bgg.aggregates import AGGREGATES_PATH, COLUMNS, combine, contributions, write_aggregates
+from bgg.data import BATCH_ROWS, DATA_PATH, SNAPSHOT_PATH, read_csv_batches, snapshot_version, write_snapshot_batches
+
+
+def _folded(batches, totals):
+    for batch in batches:
+        totals['aggregates'] = combine(totals['aggregates'], contributions(batch[COLUMNS]))
+        totals['rows'] += len(batch)
+        yield batch
+
+
+def ingest(csv_path=DATA_PATH, snapshot_path=SNAPSHOT_PATH, aggregates_path=AGGREGATES_PATH,
+           batch_rows=BATCH_ROWS):
+    """Stream csv_path into the snapshot and stored aggregates, returning the number of games."""
+    totals = {'aggregates': None, 'rows': 0}
+    write_snapshot_batches(_folded(read_csv_batches(csv_path, batch_rows), totals), snapshot_path)
+    # Versioned by the snapshot just written, so the app picks both up together.
+    write_aggregates(totals['aggregates'], snapshot_version(snapshot_path), aggregates_path)
+    return totals['rows']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Build the snapshot and yearly aggregates from a CSV in batches.')
+    parser.add_argument('csv', nargs='?', default=DATA_PATH, help='CSV in the board_games.csv format')
+    parser.add_argument('--batch-rows', type=int, default=BATCH_ROWS, help='rows read at a time')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    rows = ingest(args.csv, batch_rows=args.batch_rows)
+    print(f'Wrote {rows} games to {SNAPSHOT_PATH} and {AGGREGATES_PATH} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
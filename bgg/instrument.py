@@ -0,0 +1,147 @@
+"""Opt-in timing of the data transformations and chart renders on each page.
+
+Instrumentation is off unless the BGG_INSTRUMENT environment variable is set
+to 1 or the 'Show timings' toggle in the sidebar is switched on. While it is
+on, each named stage records its wall time and, where the page reports it,
+the number of rows it produced. The
+records are shown in a timing panel at the bottom of the sidebar, or, when a
+page section reruns on its own as a fragment and so leaves the sidebar as it
+was, at the bottom of that section (see bgg.sections). They are also logged
+as JSON through the 'bgg.instrument' logger, to stderr or to the file named
+by BGG_INSTRUMENT_LOG. Next to it a memory panel lists the frames held by the
+shared caches, which every session reads, and how much memory the objects
+created by the current run of the page still hold.
+
+With BGG_INSTRUMENT=1 each stage also records the peak memory allocated while
+it ran, measured with tracemalloc. Tracing slows every allocation in the
+process down, for every session, so the sidebar toggle never starts it, and
+as tracing is process-wide the figures are only indicative when several
+sessions render at the same time.
+"""
+import json
+import logging
+import os
+import time
+import tracemalloc
+import weakref
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+ENV_VAR = 'BGG_INSTRUMENT'
+LOG_ENV_VAR = 'BGG_INSTRUMENT_LOG'
+
+logger = logging.getLogger('bgg.instrument')
+
+# Objects held by the shared caches, by name, for the memory panel. Entries
+# drop out on their own when a cache evicts the object.
+_shared = weakref.WeakValueDictionary()
+
+
+def _configure_logger():
+    if logger.handlers:
+        return
+    path = os.environ.get(LOG_ENV_VAR)
+    handler = logging.FileHandler(path) if path else logging.StreamHandler()
+    handler.setFormatter(logging.Formatter('%(message)s'))
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+
+
+def enabled():
+    """Whether stages are being recorded for the current session."""
+    return st.session_state.get('bgg_instrument', os.environ.get(ENV_VAR) == '1')
+
+
+def begin_page(page):
+    """Add the sidebar toggle and start a fresh set of records for this run of page."""
+    st.sidebar.toggle('Show timings', value=os.environ.get(ENV_VAR) == '1', key='bgg_instrument')
+    st.session_state['bgg_timings'] = []
+    st.session_state['bgg_page'] = page
+    # Cleared by timing_panel, so fragments can tell a page run from a rerun of their own.
+    st.session_state['bgg_page_running'] = True
+    if enabled():
+        _configure_logger()
+        if os.environ.get(ENV_VAR) == '1' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        st.session_state['bgg_run_memory'] = tracemalloc.get_traced_memory()[0]
+
+
+@contextmanager
+def stage(name):
+    """Record the block as a named stage; set record['rows'] to report its output size."""
+    record = {'stage': name, 'rows': None}
+    if not enabled():
+        yield record
+        return
+    tracing = tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.reset_peak()
+        start_memory = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record['seconds'] = round(time.perf_counter() - start, 6)
+        record['peak_mb'] = (round((tracemalloc.get_traced_memory()[1] - start_memory) / 2 ** 20, 3)
+                             if tracing else None)
+        record['page'] = st.session_state.get('bgg_page')
+        st.session_state.setdefault('bgg_timings', []).append(record)
+        logger.info(json.dumps(record))
+
+
+def track_shared(name, obj):
+    """Register a DataFrame, Series or sparse matrix held by a shared cache, and return it."""
+    _shared[name] = obj
+    return obj
+
+
+def _nbytes(obj):
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True, index=False))
+    # CSR matrices, whose memory is their three arrays.
+    return int(obj.data.nbytes + obj.indices.nbytes + obj.indptr.nbytes)
+
+
+def memory_report():
+    """Frame of the objects held by the shared caches, largest first."""
+    rows = [{'object': name, 'rows': obj.shape[0], 'mb': round(_nbytes(obj) / 2 ** 20, 3)}
+            for name, obj in list(_shared.items())]
+    report = pd.DataFrame(rows, columns=['object', 'rows', 'mb'])
+    return report.sort_values('mb', ascending=False, ignore_index=True)
+
+
+def _timings_table(records):
+    timings = pd.DataFrame(records, columns=['stage', 'seconds', 'peak_mb', 'rows']).astype({'rows': 'Int64'})
+    st.caption(f"{timings['seconds'].sum():.3f}s across {len(timings)} stages")
+    st.dataframe(timings.sort_values('seconds', ascending=False), hide_index=True)
+
+
+@contextmanager
+def fragment_timings():
+    """Show the stages recorded in the block below it, when it runs as a fragment rerun of its own."""
+    first = len(st.session_state.get('bgg_timings', []))
+    yield
+    if enabled() and not st.session_state.get('bgg_page_running', False):
+        with st.expander('Timings', expanded=True):
+            _timings_table(st.session_state.get('bgg_timings', [])[first:])
+
+
+def timing_panel():
+    """Show the stages recorded during this run in the sidebar."""
+    st.session_state['bgg_page_running'] = False
+    if not enabled():
+        return
+    with st.sidebar.expander('Timings', expanded=True):
+        _timings_table(st.session_state.get('bgg_timings', []))
+    report = memory_report()
+    caption = f"{report['mb'].sum():.1f} MB shared by every session"
+    if tracemalloc.is_tracing():
+        session_mb = (tracemalloc.get_traced_memory()[0] - st.session_state.get('bgg_run_memory', 0)) / 2 ** 20
+        caption += f", {max(session_mb, 0):.1f} MB held by this session's run"
+    with st.sidebar.expander('Memory'):
+        st.caption(caption)
+        st.dataframe(report, hide_index=True)
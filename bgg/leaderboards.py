@@ -0,0 +1,107 @@
+"""Top-N rankings of games by a metric, overall and within year ranges.
+
+A leaderboard keeps, once per dataset version, the LEADERBOARD_SIZE best games
+of every release year and of the whole dataset, found by partial selection
+rather than by sorting every game. Any year range's top N, for N up to
+LEADERBOARD_SIZE, is among the kept games of the years in the range, so a query
+only ranks those.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bgg.aggregates import MIN_USERS_RATED
+from bgg.data import dataset_version, load_games
+from bgg.filters import select, sorted_index
+
+# Games kept per year, and the most a query can ask for.
+LEADERBOARD_SIZE = 100
+
+# Metrics games can be ranked by, with the vote count column that must reach
+# min_votes for a game's value to be ranked, if any.
+METRICS = {
+    'total_owners': None,
+    'average_rating': 'users_rated',
+    'average_weight': 'total_weights',
+}
+
+# years and the aligned positions and values hold the kept games of every
+# year, in ascending year order; overall holds the positions of the dataset's
+# best games, including those without a known year. Positions are rows of the
+# frames returned by load_games.
+Leaderboard = namedtuple('Leaderboard', ['years', 'positions', 'values', 'overall'])
+
+
+def _best(positions, values, size):
+    """The positions of the size largest values, best first, ties in row order."""
+    if len(positions) > size:
+        # Every value tied with the last one kept stays in, for row order to decide between.
+        cutoff = np.partition(values, len(values) - size)[len(values) - size]
+        keep = values >= cutoff
+        positions, values = positions[keep], values[keep]
+    order = np.lexsort((positions, -values))[:size]
+    return positions[order]
+
+
+@st.cache_resource(max_entries=8, show_spinner=False)
+def _build_leaderboard(metric, min_votes, version):
+    values = load_games([metric])[metric].to_numpy(dtype='float64', na_value=np.nan)
+    votes = METRICS[metric]
+    eligible = np.sort(select(votes, min_votes)) if votes else np.arange(len(values))
+    eligible = eligible[~np.isnan(values[eligible])]
+    overall = _best(eligible, values[eligible], LEADERBOARD_SIZE)
+
+    by_year = sorted_index('yearpublished')
+    in_year = np.isin(by_year.positions, eligible)
+    years, positions = by_year.values[in_year].astype(int), by_year.positions[in_year]
+    kept_years, kept_positions = [], []
+    starts = np.flatnonzero(np.r_[True, years[1:] != years[:-1]])
+    for start, end in zip(starts, np.r_[starts[1:], len(years)]):
+        best = _best(positions[start:end], values[positions[start:end]], LEADERBOARD_SIZE)
+        kept_years.append(np.full(len(best), years[start]))
+        kept_positions.append(best)
+    kept_years = np.concatenate(kept_years) if kept_years else np.empty(0, dtype=int)
+    kept_positions = np.concatenate(kept_positions) if kept_positions else np.empty(0, dtype=int)
+    return Leaderboard(kept_years, kept_positions, values[kept_positions], overall)
+
+
+def leaderboard(metric, min_votes=MIN_USERS_RATED):
+    """Return the Leaderboard of metric, over games with at least min_votes votes towards it.
+
+    The arrays are shared between sessions and must not be modified.
+    """
+    return _build_leaderboard(metric, min_votes if METRICS[metric] else None, dataset_version())
+
+
+def top_games(metric, n=50, start=None, end=None, min_votes=MIN_USERS_RATED, columns=('name', 'yearpublished')):
+    """The n games with the largest metric, best first, released between start and end inclusive.
+
+    Without start and end every game is ranked, including those without a
+    known release year. n is capped at LEADERBOARD_SIZE.
+    """
+    board = leaderboard(metric, min_votes)
+    n = min(n, LEADERBOARD_SIZE)
+    if start is None and end is None:
+        positions = board.overall[:n]
+    else:
+        first = 0 if start is None else np.searchsorted(board.years, start, side='left')
+        last = len(board.years) if end is None else np.searchsorted(board.years, end, side='right')
+        positions = _best(board.positions[first:last], board.values[first:last], n)
+    games = load_games(list(dict.fromkeys([*columns, metric]))).iloc[positions]
+    return games.reset_index(drop=True)
+
+
+def yearly_top_games(metric, n=10, start=None, end=None, min_votes=MIN_USERS_RATED, columns=('name',)):
+    """The n games with the largest metric in each release year between start and end, best first."""
+    board = leaderboard(metric, min_votes)
+    n = min(n, LEADERBOARD_SIZE)
+    first = 0 if start is None else np.searchsorted(board.years, start, side='left')
+    last = len(board.years) if end is None else np.searchsorted(board.years, end, side='right')
+    years = pd.Series(board.years[first:last])
+    # The kept games are already ordered best first within each year.
+    keep = (years.groupby(years).cumcount() < n).to_numpy()
+    positions = board.positions[first:last][keep]
+    games = load_games(list(dict.fromkeys([*columns, metric]))).iloc[positions]
+    return games.assign(yearpublished=board.years[first:last][keep]).reset_index(drop=True)
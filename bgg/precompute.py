@@ -0,0 +1,51 @@
+"""Build the stored artifacts for the current dataset across several cores.
+
+After the snapshot is brought up to date, the dataset profile and each part
+of the yearly aggregates (see aggregates.PARTS) are independent of each other,
+so they are computed in a process pool, each worker reading only the snapshot
+columns it needs, and then stored where the pages look for them. Run it after
+replacing board_games.csv so the first page view does not pay for them:
+
+    python -m bgg.precompute --workers 4
+"""
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from bgg import aggregates, profile
+from bgg.data import SNAPSHOT_PATH, dataset_version
+
+
+def _aggregate_part(part, snapshot_path):
+    games = pd.read_parquet(snapshot_path, columns=aggregates.part_columns(part))
+    return aggregates.part_contributions(games, part)
+
+
+def _profile(snapshot_path):
+    return profile.build_profile(pd.read_parquet(snapshot_path))
+
+
+def precompute(workers=None):
+    """Build and store the profile and yearly aggregates in parallel."""
+    version = dataset_version()
+    with ProcessPoolExecutor(workers) as pool:
+        # The profile is the largest task, so it is started first.
+        profile_task = pool.submit(_profile, SNAPSHOT_PATH)
+        part_tasks = [pool.submit(_aggregate_part, part, SNAPSHOT_PATH) for part in aggregates.PARTS]
+        aggregates.write_aggregates(aggregates.combine(*(task.result() for task in part_tasks)), version)
+        profile.write_profile(profile_task.result(), version)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Precompute the stored artifacts for board_games.csv.')
+    parser.add_argument('--workers', type=int, help='worker processes, defaults to the number of cores')
+    args = parser.parse_args()
+    start = time.perf_counter()
+    precompute(args.workers)
+    print(f'Wrote {aggregates.AGGREGATES_PATH} and {profile.PROFILE_PATH} in {time.perf_counter() - start:.1f}s')
+
+
+if __name__ == '__main__':
+    main()
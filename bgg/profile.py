@@ -0,0 +1,100 @@
+"""Dataset profile shown on the exploration page.
+
+The df.info() and df.describe() summaries, per-column null and distinct
+counts, quantiles and outlier counts for the play time and player columns are
+computed once per dataset version and stored as a small JSON artifact next to
+the snapshot. Run ``python -m bgg.profile`` to build it ahead of time.
+"""
+import io
+import json
+import os
+
+import pandas as pd
+import streamlit as st
+
+from bgg.data import TAG_COLUMNS, dataset_version, load_games
+
+PROFILE_PATH = 'board_games.profile.json'
+
+OUTLIER_COLUMNS = ['playingtime', 'maxplaytime', 'minplaytime', 'maxplayers']
+
+QUANTILES = [0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99]
+
+FRAMES = ['describe', 'columns', 'quantiles', 'outliers']
+
+
+def outlier_counts(df, columns=OUTLIER_COLUMNS):
+    """Games outside the 1.5 x IQR fences of each column."""
+    rows = {}
+    for column in columns:
+        q1, q3 = df[column].quantile([0.25, 0.75])
+        lower, upper = q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1)
+        rows[column] = {
+            'lower_fence': lower,
+            'upper_fence': upper,
+            'below': int((df[column] < lower).sum()),
+            'above': int((df[column] > upper).sum()),
+            'max': df[column].max(),
+        }
+    return pd.DataFrame.from_dict(rows, orient='index')
+
+
+def build_profile(df):
+    """Summaries of df, as a dict of the info text and profile frames."""
+    buffer = io.StringIO()
+    df.info(buf=buffer)
+    # Tag columns hold lists, so count the distinct tags rather than tag lists.
+    distinct = {column: df[column].explode().nunique() if column in TAG_COLUMNS else df[column].nunique()
+                for column in df.columns}
+    return {
+        'info': buffer.getvalue(),
+        'describe': df.describe(),
+        'columns': pd.DataFrame({'nulls': df.isna().sum(), 'distinct': pd.Series(distinct)}),
+        'quantiles': df.select_dtypes('number').quantile(QUANTILES).T,
+        'outliers': outlier_counts(df),
+    }
+
+
+def write_profile(profile, version, path=PROFILE_PATH):
+    """Store a profile, tagged with the dataset version it describes."""
+    document = {'version': list(version), 'info': profile['info']}
+    for name in FRAMES:
+        document[name] = json.loads(profile[name].to_json(orient='split'))
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(document, f)
+    os.replace(tmp_path, path)
+
+
+def read_profile(version, path=PROFILE_PATH):
+    """Load the stored profile, or None if it is missing or for another version."""
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        document = json.load(f)
+    if document['version'] != list(version):
+        return None
+    profile = {'info': document['info']}
+    for name in FRAMES:
+        profile[name] = pd.DataFrame(**document[name])
+    return profile
+
+
+@st.cache_resource(max_entries=1, show_spinner='Profiling board games...')
+def _load_profile(version):
+    profile = read_profile(version)
+    if profile is None:
+        profile = build_profile(load_games())
+        write_profile(profile, version)
+    return profile
+
+
+def dataset_profile():
+    """Profile of the current dataset version, built and stored on first use."""
+    return _load_profile(dataset_version())
+
+
+if __name__ == '__main__':
+    version = dataset_version()
+    write_profile(build_profile(load_games()), version)
+    print(f'Wrote {PROFILE_PATH}')
@@ -0,0 +1,85 @@
+"""Apply a BGG re-scrape to the stored snapshot without a full rebuild.
+
+Rows are matched on the BGG id. Inserted and updated rows replace whatever the
+snapshot held for their id, deleted ids are dropped, and the stored yearly
+aggregates are adjusted by subtracting the contributions of the old rows and
+adding those of the new ones, instead of being recomputed from every game.
+
+    python -m bgg.refresh new_scrape.csv            # diff a full scrape
+    python -m bgg.refresh changes.csv --delta       # rows already known to have changed
+    python -m bgg.refresh --deleted ids.txt         # ids removed from BGG
+"""
+import argparse
+
+import pandas as pd
+
+from bgg.aggregates import (AGGREGATES_PATH, COLUMNS, combine, contributions, read_aggregates,
+                            write_aggregates)
+from bgg.data import (SNAPSHOT_PATH, TAG_COLUMNS, dataset_version, join_tags, read_csv, snapshot_version,
+                      write_snapshot)
+
+
+def scrape_delta(snapshot, scrape):
+    """Rows of scrape that are new or changed, and ids of snapshot missing from it."""
+    deleted = snapshot.loc[~snapshot['id'].isin(scrape['id']), 'id']
+    old = snapshot.set_index('id')
+    new = scrape.set_index('id')
+    common = new.index.intersection(old.index)
+    old_common, new_common = old.loc[common, new.columns], new.loc[common]
+    for column in TAG_COLUMNS:
+        old_common[column] = join_tags(old_common[column])
+        new_common[column] = join_tags(new_common[column])
+    same = old_common.eq(new_common).fillna(False).astype(bool) | (old_common.isna() & new_common.isna())
+    changed = ~same.all(axis=1)
+    upserts = new.loc[~new.index.isin(old.index) | new.index.isin(changed[changed].index)]
+    return upserts.reset_index(), deleted.tolist()
+
+
+def apply_delta(upserts, deleted_ids=(), snapshot_path=SNAPSHOT_PATH, aggregates_path=AGGREGATES_PATH):
+    """Upsert rows and drop deleted ids in the snapshot and the stored aggregates."""
+    snapshot = pd.read_parquet(snapshot_path)
+    touched = snapshot['id'].isin(upserts['id']) | snapshot['id'].isin(list(deleted_ids))
+    aggregates = read_aggregates(snapshot_version(snapshot_path), aggregates_path)
+    if aggregates is None:
+        aggregates = combine(contributions(snapshot[COLUMNS]))
+    aggregates = combine(aggregates,
+                         contributions(snapshot.loc[touched, COLUMNS], sign=-1),
+                         contributions(upserts[COLUMNS]))
+    snapshot = pd.concat([snapshot[~touched], upserts[snapshot.columns]], ignore_index=True)
+    write_snapshot(snapshot, snapshot_path)
+    # Versioned by the snapshot just written, so the app picks both up together.
+    write_aggregates(aggregates, snapshot_version(snapshot_path), aggregates_path)
+    return int(touched.sum()), len(upserts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply a BGG re-scrape to the stored snapshot.')
+    parser.add_argument('scrape', nargs='?', help='CSV in the board_games.csv format')
+    parser.add_argument('--delta', action='store_true',
+                        help='the CSV only holds inserted or updated rows, rather than a full scrape')
+    parser.add_argument('--deleted', help='file of BGG ids to delete, one per line')
+    args = parser.parse_args()
+
+    if not args.scrape and not args.deleted:
+        parser.error('nothing to apply')
+
+    # Make sure the snapshot reflects board_games.csv before patching it.
+    dataset_version()
+    snapshot = pd.read_parquet(SNAPSHOT_PATH)
+    deleted_ids = []
+    if args.deleted:
+        with open(args.deleted) as f:
+            deleted_ids = [int(line) for line in f if line.strip()]
+    if not args.scrape:
+        upserts = snapshot.iloc[:0]
+    elif args.delta:
+        upserts = read_csv(args.scrape)
+    else:
+        upserts, missing_ids = scrape_delta(snapshot, read_csv(args.scrape))
+        deleted_ids += missing_ids
+    removed, added = apply_delta(upserts, deleted_ids)
+    print(f'Replaced or deleted {removed} rows and wrote {added} rows to {SNAPSHOT_PATH}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""Fuzzy game search over a trigram index.
+
+Every game's name (or designer) is normalised to lower case words without
+accents or punctuation, and broken into the overlapping three letter
+sequences of each word padded with two spaces before and one after, as in
+PostgreSQL's pg_trgm. The sequences are numbered and stored once per dataset
+version as a sparse games x trigrams matrix, whose columns are the posting
+lists of the games containing each trigram. A query is broken up the same
+way, and the games sharing any of its trigrams are scored by Jaccard
+similarity from their posting lists alone, without scanning every name.
+"""
+import re
+import unicodedata
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+from scipy import sparse
+
+from bgg.data import dataset_version, load_games
+from bgg.instrument import track_shared
+
+# Columns a SearchIndex can be built over.
+SEARCH_FIELDS = ['name', 'designer']
+
+# matrix is a CSC games x trigrams matrix of 0/1 entries, aligned row for row
+# with load_games frames, vocabulary maps each trigram to its column and sizes
+# holds the number of distinct trigrams of each game.
+SearchIndex = namedtuple('SearchIndex', ['matrix', 'vocabulary', 'sizes'])
+
+
+def normalise(text):
+    """Lower case words of text, with accents and punctuation removed."""
+    text = unicodedata.normalize('NFKD', text).encode('ascii', 'ignore').decode()
+    return re.findall(r'[0-9a-z]+', text.lower())
+
+
+def trigrams(text, partial=False):
+    """The set of padded trigrams of text's words.
+
+    With partial, the last word is taken to be still being typed, so the
+    trigram marking its end is left out and it matches longer words too.
+    """
+    words = normalise(text)
+    grams = set()
+    for i, word in enumerate(words):
+        padded = f'  {word}' if partial and i == len(words) - 1 else f'  {word} '
+        grams.update(padded[j:j + 3] for j in range(len(padded) - 2))
+    return grams
+
+
+@st.cache_resource(max_entries=2, show_spinner='Indexing names...')
+def _build_search_index(field, version):
+    values = load_games([field])[field].astype(object)
+    vocabulary = {}
+    rows, columns = [], []
+    for row, value in enumerate(values):
+        if not isinstance(value, str):
+            continue
+        grams = trigrams(value)
+        rows.extend([row] * len(grams))
+        columns.extend(vocabulary.setdefault(gram, len(vocabulary)) for gram in grams)
+    matrix = sparse.csc_matrix((np.ones(len(rows), dtype=np.int8), (rows, columns)),
+                               shape=(len(values), len(vocabulary)))
+    sizes = np.diff(matrix.tocsr().indptr).astype(np.int32)
+    return SearchIndex(track_shared(f'{field} search index {version}', matrix), vocabulary, sizes)
+
+
+def search_index(field='name'):
+    """Return the SearchIndex over field, one of SEARCH_FIELDS.
+
+    The matrix and arrays are shared between sessions and must not be modified.
+    """
+    return _build_search_index(field, dataset_version())
+
+
+def search_games(query, limit=20, field='name', columns=('name', 'yearpublished')):
+    """The games best matching query by trigram similarity, best first, with their score."""
+    index = search_index(field)
+    grams = trigrams(query, partial=True)
+    matrix = index.matrix
+    postings = [matrix.indices[matrix.indptr[column]:matrix.indptr[column + 1]]
+                for column in (index.vocabulary[gram] for gram in grams if gram in index.vocabulary)]
+    shared = np.bincount(np.concatenate(postings or [np.empty(0, dtype=np.int32)]), minlength=len(index.sizes))
+    candidates = np.flatnonzero(shared)
+    scores = shared[candidates] / (len(grams) + index.sizes[candidates] - shared[candidates])
+    if len(candidates) > limit:
+        # Every match tied with the last one kept stays in, for owners to decide between.
+        cutoff = np.partition(scores, len(scores) - limit)[len(scores) - limit]
+        keep = scores >= cutoff
+        candidates, scores = candidates[keep], scores[keep]
+    games = load_games(list(dict.fromkeys([*columns, 'total_owners'])))
+    # Equally good matches go to the more widely owned game.
+    owners = games['total_owners'].to_numpy()[candidates]
+    order = np.lexsort((-owners, -scores))[:limit]
+    found = games.iloc[candidates[order]][list(columns)]
+    return found.assign(score=scores[order].round(3)).reset_index(names='row')
@@ -0,0 +1,31 @@
+"""Page sections that only run while they are open.
+
+A long page pays for every chart and grid on every rerun. lazy_section puts
+one part of a page in an expander and only runs it while the expander is
+open, as a fragment, so widgets inside a section rerun that section alone and
+opening or closing one section leaves the others' work to the caches.
+"""
+import functools
+
+import streamlit as st
+
+from bgg.instrument import fragment_timings
+
+# Session state key that opens every section, for rendering whole pages
+# headlessly (see bgg.export).
+EXPAND_ALL_KEY = 'bgg_expand_sections'
+
+
+def lazy_section(label, key, render, expanded=False):
+    """Call render inside an expander, only while the expander is open."""
+    expanded = expanded or st.session_state.get(EXPAND_ALL_KEY, False)
+    section = st.expander(label, expanded=expanded, key=key, on_change='rerun')
+    if section.open:
+        @functools.wraps(render)
+        def run():
+            # A rerun of the section alone never reaches the sidebar's timing panel.
+            with fragment_timings():
+                render()
+
+        with section:
+            st.fragment(run)()
@@ -0,0 +1,23 @@
+"""Start the app with its caches warming from the moment the server starts.
+
+Takes the same options as ``streamlit run``, and is run from the directory
+holding board_games.csv like the app itself:
+
+    python -m bgg.serve --server.port 8501
+"""
+import logging
+import sys
+
+from streamlit.web import cli
+
+from bgg.warmup import start_warmup
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    start_warmup()
+    cli.main(['run', '1_Overview.py'] + sys.argv[1:], prog_name='streamlit')
+
+
+if __name__ == '__main__':
+    main()
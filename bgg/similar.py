@@ -0,0 +1,72 @@
+"""Games like a given game, by their mechanics and categories.
+
+Every game's tags are stacked into one sparse vector over both families,
+each tag weighted by its inverse document frequency so that sharing a rare
+mechanic counts for more than sharing Dice Rolling, and the vectors are
+normalised to unit length once per dataset version. The cosine similarity of
+one game to every other is then a single sparse matrix-vector product, linear
+in the number of tags used rather than quadratic in the number of games.
+"""
+from collections import namedtuple
+
+import numpy as np
+import streamlit as st
+from scipy import sparse
+
+from bgg.data import TAG_COLUMNS, dataset_version, load_games
+from bgg.instrument import track_shared
+from bgg.tags import tag_incidence
+
+# Largest difference in average weight, on BGG's 1 to 5 scale.
+WEIGHT_RANGE = 4
+
+# matrix is a CSR games x tags matrix of unit-length rows, aligned row for row
+# with load_games frames, and vocabulary labels its columns as (family, tag).
+SimilarityIndex = namedtuple('SimilarityIndex', ['matrix', 'vocabulary'])
+
+
+@st.cache_resource(max_entries=1, show_spinner='Indexing tags...')
+def _build_similarity_index(version):
+    incidences = [tag_incidence(family) for family in TAG_COLUMNS]
+    matrix = sparse.hstack([incidence.matrix for incidence in incidences], format='csr', dtype=np.float64)
+    vocabulary = [(family, tag) for family, incidence in zip(TAG_COLUMNS, incidences)
+                  for tag in incidence.vocabulary]
+    games_using = np.bincount(matrix.indices, minlength=matrix.shape[1])
+    matrix = matrix @ sparse.diags(np.log(matrix.shape[0] / np.maximum(games_using, 1)))
+    lengths = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+    matrix = sparse.diags(1 / np.where(lengths > 0, lengths, 1)) @ matrix
+    return SimilarityIndex(track_shared(f'similarity index {version}', matrix.tocsr()), vocabulary)
+
+
+def similarity_index():
+    """Return the SimilarityIndex of the current dataset.
+
+    The matrix is shared between sessions and must not be modified.
+    """
+    return _build_similarity_index(dataset_version())
+
+
+def similar_games(row, k=10, match_weight=False, columns=('name', 'yearpublished', 'average_rating',
+                                                          'average_weight')):
+    """The k games most similar to the game at row of load_games frames, most similar first.
+
+    Similarity is the cosine of the games' weighted tag vectors. With
+    match_weight it is also scaled down by how far apart the games' average
+    weights are, for games whose weight has been voted on.
+    """
+    matrix = similarity_index().matrix
+    scores = matrix @ matrix[row].T
+    scores = scores.toarray().ravel()
+    if match_weight:
+        games = load_games(['average_weight', 'total_weights'])
+        weights = games['average_weight'].to_numpy()
+        voted = games['total_weights'].to_numpy() > 0
+        if voted[row]:
+            scores = np.where(voted, scores * (1 - np.abs(weights - weights[row]) / WEIGHT_RANGE), scores)
+    scores[row] = 0
+    candidates = np.flatnonzero(scores > 0)
+    if len(candidates) > k:
+        candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+    candidates = candidates[np.lexsort((candidates, -scores[candidates]))]
+    games = load_games(list(columns)).iloc[candidates]
+    return games.assign(similarity=scores[candidates].round(3)).reset_index(names='row')
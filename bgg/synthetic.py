@@ -0,0 +1,162 @@
+"""Synthetic datasets in the board_games.csv layout, for load testing offline.
+
+The generated games follow the shape of the real scrape closely enough for
+the pages to tell the same story at any scale: releases growing year on year
+until 2019 and falling through the pandemic, a long tail of rarely rated
+games, ratings and mechanics per game creeping up over time, a few percent of
+'unknown' release years, play times with multi-day wargame outliers, and
+comma separated mechanics and categories including the BGG mechanic names
+that themselves contain commas. Names pair a common word with an invented one,
+so, as in the scrape, most names are distinct and their number grows with the
+number of games instead of running out at a fixed vocabulary.
+
+    python -m bgg.synthetic 1000000 --output board_games.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+# Each vocabulary is ordered from most to least popular.
+MECHANICS = [
+    'Dice Rolling', 'Hand Management', 'Set Collection', 'Variable Player Powers', 'Hexagon Grid',
+    'Simulation', 'Roll / Spin and Move', 'Open Drafting', 'Tile Placement', 'Cooperative Game',
+    'Area Majority / Influence', 'Modular Board', 'Grid Movement', 'Point to Point Movement', 'Memory',
+    'Trading', 'Auction/Bidding', 'Deck, Bag, and Pool Building', 'Worker Placement', 'Action Points',
+    'Push Your Luck', 'Team-Based Game', 'Measurement Movement', 'Solo / Solitaire Game',
+    'Take That', 'Network and Route Building', 'Pattern Building', 'Player Elimination',
+    'Worker Placement, Different Worker Types', 'Area Movement', 'Enclosure', 'Betting and Bluffing',
+    'Voting', 'Trick-taking', 'Simultaneous Action Selection', 'Campaign / Battle Card Driven',
+    'Pick-up and Deliver', 'Deduction', 'Race', 'I Cut, You Choose',
+]
+CATEGORIES = [
+    'Card Game', 'Wargame', "Children's Game", 'Party Game', 'Dice', 'Fantasy', 'Abstract Strategy',
+    'Economic', 'Fighting', 'Science Fiction', 'Bluffing', 'Educational', 'Adventure', 'Animals',
+    'Trivia', 'Humor', 'Deduction', 'Memory', 'World War II', 'Action / Dexterity', 'Miniatures',
+    'Movies / TV / Radio theme', 'Sports', 'Medieval', 'Print & Play', 'Word Game', 'Exploration',
+    'Puzzle', 'Racing', 'Horror',
+]
+
+NAME_WORDS = [
+    'Lost', 'Ancient', 'Crimson', 'Dragon', 'Harbor', 'Empire', 'Quest', 'Kingdom', 'Star', 'Shadow',
+    'River', 'Castle', 'Garden', 'Iron', 'Frontier', 'Legacy', 'Island', 'Market', 'Tower', 'Voyage',
+    'Storm', 'Crown', 'Forest', 'Heist', 'Colony', 'Orbit', 'Temple', 'Railway', 'Feast', 'Siege',
+]
+# Invented words are two or three of these run together, such as Kalorin.
+SYLLABLES = ['ka', 'lor', 'in', 'mi', 'zan', 'the', 'ra', 'vel', 'dor', 'is', 'quen', 'tor', 'ba', 'sil', 'mar',
+             'en', 'go', 'ria', 'ul', 'nex', 'tha', 'os', 'fen', 'dru']
+DESIGNERS = [f'{first} {last}' for first in ['Alex', 'Sam', 'Jo', 'Max', 'Kim', 'Lee', 'Ana', 'Eli']
+             for last in ['Smith', 'Rossi', 'Nakamura', 'Dubois', 'Schmidt', 'Novak', 'Silva', 'Olsen']]
+
+FIRST_YEAR, LAST_YEAR = 1950, 2023
+
+# Rows generated at a time when drawing tag sets, which bounds memory use.
+CHUNK_SIZE = 100_000
+
+
+def release_year_weights():
+    """Relative number of releases per year, FIRST_YEAR to LAST_YEAR."""
+    years = np.arange(FIRST_YEAR, LAST_YEAR + 1)
+    weights = np.exp(0.07 * (years - FIRST_YEAR))
+    # Pandemic era production and shipping problems.
+    weights[years >= 2020] *= np.array([0.85, 0.7, 0.5, 0.45])[years[years >= 2020] - 2020]
+    return years, weights / weights.sum()
+
+
+def _draw_tags(rng, vocabulary, counts):
+    """Comma separated tag sets of the given sizes, drawn by Zipf-like popularity."""
+    log_weights = -np.log(np.arange(1, len(vocabulary) + 1))
+    vocabulary = np.array(vocabulary, dtype=object)
+    tags = []
+    for start in range(0, len(counts), CHUNK_SIZE):
+        chunk = counts[start:start + CHUNK_SIZE]
+        # Gumbel top-k draws k distinct tags per game with the given weights.
+        keys = log_weights + rng.gumbel(size=(len(chunk), len(vocabulary)))
+        order = np.argsort(-keys, axis=1)
+        tags += [','.join(vocabulary[row[:count]]) if count else None for row, count in zip(order, chunk)]
+    return tags
+
+
+def synthetic_games(size, seed=0, unknown_year_share=0.02):
+    """A frame of size synthetic games in the board_games.csv layout."""
+    rng = np.random.default_rng(seed)
+
+    ids = np.cumsum(rng.geometric(0.3, size))
+    words = np.array(NAME_WORDS, dtype=object)
+    syllables = np.array(SYLLABLES, dtype=object)
+    initials = np.array([syllable.capitalize() for syllable in SYLLABLES], dtype=object)
+    coined = (initials[rng.integers(0, len(syllables), size)] + syllables[rng.integers(0, len(syllables), size)]
+              + np.where(rng.random(size) < 0.6, syllables[rng.integers(0, len(syllables), size)], ''))
+    common = words[rng.integers(0, len(words), size)]
+    names = np.where(rng.random(size) < 0.5, common + ' ' + coined, coined + ' ' + common)
+    # Some names have a second common word, as in Empire Kalorin Dragon.
+    longer = rng.random(size) < 0.2
+    names[longer] = names[longer] + ' ' + words[rng.integers(0, len(words), longer.sum())]
+    numbered = rng.random(size) < 0.3
+    names[numbered] = names[numbered] + ' ' + rng.integers(2, 10, numbered.sum()).astype(str).astype(object)
+
+    years, weights = release_year_weights()
+    year = rng.choice(years, size, p=weights)
+    unknown = rng.random(size) < unknown_year_share
+    yearpublished = year.astype(object)
+    yearpublished[unknown] = 'unknown'
+    recency = (year - FIRST_YEAR) / (LAST_YEAR - FIRST_YEAR)
+
+    users_rated = np.minimum(np.floor(rng.pareto(1.1, size) * 8), 150_000).astype(int)
+    rated = users_rated > 0
+    average_rating = np.where(rated, np.clip(rng.normal(5.6 + 1.6 * recency, 1.0), 1, 10), 0).round(5)
+    total_weights = np.floor(users_rated * rng.uniform(0.02, 0.15, size)).astype(int)
+    average_weight = np.where(total_weights > 0, np.clip(rng.normal(1.6 + 1.0 * recency, 0.7), 1, 5), 0).round(4)
+    total_owners = np.floor(users_rated * rng.uniform(1.2, 2.5, size)).astype(int)
+
+    minplayers = rng.choice([1, 2, 3, 4], size, p=[0.2, 0.65, 0.1, 0.05])
+    maxplayers = minplayers + rng.choice([0, 1, 2, 3, 4, 6], size, p=[0.1, 0.2, 0.35, 0.2, 0.1, 0.05])
+    party = rng.random(size) < 0.03
+    maxplayers[party] = rng.integers(11, 100, party.sum())
+
+    minplaytime = np.maximum(5, np.round(rng.lognormal(np.log(30), 0.7, size) / 5) * 5).astype(int)
+    maxplaytime = (minplaytime * rng.choice([1, 1.5, 2, 3], size, p=[0.5, 0.2, 0.2, 0.1])).astype(int)
+    # Wargames and campaign games timed by the whole game rather than a session.
+    long_games = rng.random(size) < 0.002
+    maxplaytime[long_games] = rng.integers(1440, 84_000, long_games.sum())
+    playingtime = maxplaytime.copy()
+
+    mechanic_counts = np.minimum(rng.poisson(1.2 + 3.5 * recency ** 3), len(MECHANICS))
+    category_counts = np.minimum(rng.poisson(1.8 + 0.8 * recency), len(CATEGORIES))
+
+    designers = np.array(DESIGNERS + ['(Uncredited)'], dtype=object)
+    designer = designers[rng.integers(0, len(designers), size)]
+    designer[rng.random(size) < 0.01] = None
+
+    return pd.DataFrame({
+        'id': ids,
+        'name': names,
+        'yearpublished': yearpublished,
+        'minplayers': minplayers,
+        'maxplayers': maxplayers,
+        'playingtime': playingtime,
+        'minplaytime': minplaytime,
+        'maxplaytime': maxplaytime,
+        'users_rated': users_rated,
+        'average_rating': average_rating,
+        'total_owners': total_owners,
+        'total_weights': total_weights,
+        'average_weight': average_weight,
+        'categories': _draw_tags(rng, CATEGORIES, category_counts),
+        'mechanics': _draw_tags(rng, MECHANICS, mechanic_counts),
+        'designer': designer,
+    })
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic board_games.csv.')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--output', default='board_games.csv')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    synthetic_games(args.rows, args.seed).to_csv(args.output, index=False)
+    print(f'Wrote {args.rows} games to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
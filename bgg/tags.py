@@ -0,0 +1,52 @@
+"""Mechanics and categories as sparse game x tag incidence matrices.
+
+A tag family's list-encoded column is folded into a games x tags matrix of
+0/1 entries, with the tags numbered in sorted order, so that counting tags
+over any set of games is a sparse matrix product on integer codes rather
+than a grouping of the tag strings. incidence_matrix does this for any frame
+of games, which is how the yearly aggregates count tags (see
+bgg.aggregates), and tag_incidence keeps the matrix of the whole dataset once
+per dataset version, aligned row for row with load_games frames, for the
+similarity index (see bgg.similar).
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+from scipy import sparse
+
+from bgg.data import dataset_version, load_games
+from bgg.instrument import track_shared
+
+# matrix is a games x tags CSR matrix of 0/1 entries, aligned row for row with
+# load_games frames, and vocabulary labels its columns.
+TagIncidence = namedtuple('TagIncidence', ['matrix', 'vocabulary'])
+
+
+def incidence_matrix(tag_lists):
+    """The games x tags CSR matrix of 0/1 entries of list-encoded tags, and the Index of its columns."""
+    lengths = np.array([0 if tags is None else len(tags) for tags in tag_lists], dtype=np.int64)
+    rows = np.repeat(np.arange(len(lengths)), lengths)
+    tags = [tag for game_tags in tag_lists if game_tags is not None for tag in game_tags]
+    columns, vocabulary = pd.factorize(pd.Index(tags, dtype=object), sort=True)
+    matrix = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, columns)),
+                               shape=(len(lengths), len(vocabulary)))
+    # A game listing the same tag twice still only counts once.
+    matrix.sum_duplicates()
+    matrix.data[:] = 1
+    return matrix, vocabulary.astype(str)
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _build_tag_incidence(family, version):
+    matrix, vocabulary = incidence_matrix(load_games([family])[family].to_numpy())
+    return TagIncidence(track_shared(f'{family} incidence {version}', matrix), vocabulary)
+
+
+def tag_incidence(family):
+    """Return the TagIncidence for 'mechanics' or 'categories'.
+
+    The matrix is shared between sessions and must not be modified.
+    """
+    return _build_tag_incidence(family, dataset_version())
@@ -0,0 +1,62 @@
+"""Year-over-year popularity of mechanics and categories.
+
+Tag usage is materialised once per dataset version as a year x tag table of
+the percentage of that year's releases using each tag. Comparisons between any
+years, or year ranges given as (start, end) tuples, are then served from that
+table without touching the games again.
+"""
+import pandas as pd
+import streamlit as st
+
+from bgg.aggregates import yearly_releases, yearly_tag_counts
+from bgg.data import dataset_version
+
+
+@st.cache_resource(max_entries=4, show_spinner=False)
+def _build_yearly_tag_share(family, version):
+    counts = yearly_tag_counts(family)
+    return counts.div(yearly_releases().reindex(counts.index), axis=0) * 100
+
+
+def yearly_tag_share(family):
+    """Year x tag table of the percentage of each year's releases using each tag.
+
+    The frame is shared between sessions and must not be modified.
+    """
+    return _build_yearly_tag_share(family, dataset_version())
+
+
+def period_label(period):
+    """Column label for a year or an inclusive (start, end) year range."""
+    if isinstance(period, tuple):
+        return f'{period[0]}-{period[1]}'
+    return str(period)
+
+
+def tag_share(family, periods):
+    """Percentage of releases using each tag, with one column per period."""
+    table = yearly_tag_share(family)
+    counts = yearly_tag_counts(family)
+    releases = yearly_releases()
+    shares = {}
+    for period in periods:
+        start, end = period if isinstance(period, tuple) else (period, period)
+        if start == end and start in table.index:
+            shares[period_label(period)] = table.loc[start]
+        else:
+            shares[period_label(period)] = counts.loc[start:end].sum() / releases.loc[start:end].sum() * 100
+    return pd.DataFrame(shares).rename_axis(family)
+
+
+def tag_share_change(family, periods, top=50):
+    """Long-form (tag, year, percent) share of the tags in every period's top N.
+
+    Tags are ranked by share within each period, and only tags ranked in the top
+    N of all periods are kept, which is what the slope charts plot.
+    """
+    shares = tag_share(family, periods)
+    keep = shares.index
+    for label in shares.columns:
+        used = shares[label][shares[label] > 0]
+        keep = keep.intersection(used.nlargest(top).index, sort=False)
+    return shares.loc[keep].reset_index().melt(id_vars=[family], var_name='year', value_name='percent')
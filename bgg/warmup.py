@@ -0,0 +1,159 @@
+"""Warm the shared caches in the background before the first visitor.
+
+start_warmup runs every expensive cached step the pages depend on in a
+background thread: bringing the snapshot up to date, loading the games, the
+dataset profile, the yearly aggregates and metrics cube, the tag indexes and
+shares, the filter indexes, leaderboards, name search and similarity indexes,
+and the strip plot chart specs. The caches are shared by every session, so
+visitors arriving after it finishes only pay for rendering.
+
+While the caches are warming static/ready.json is absent; once they are warm
+it is written with the dataset version, and with ``server.enableStaticServing``
+on it is served at /app/static/ready.json, for a load balancer to route only
+to warm instances. The overview page starts warming on its first visit; to
+start as the server starts instead, launch the app with ``python -m bgg.serve``.
+
+Once warm, the thread keeps watching the CSV and the snapshot. When either
+changes, for example after ``python -m bgg.refresh`` or ``python -m bgg.ingest``,
+it removes ready.json and warms the caches for the new dataset.
+
+Setting BGG_WARMUP=0 turns warming off, for headless runs of the pages such
+as bgg.export and the benchmarks.
+"""
+import json
+import logging
+import os
+import threading
+import time
+
+import streamlit as st
+
+from bgg.aggregates import MIN_USERS_RATED, yearly_metrics
+from bgg.charts import STRIP_PLOT_START, chart_spec, yearly_strip_plot
+from bgg.data import (DATA_PATH, SNAPSHOT_PATH, TAG_COLUMNS, dataset_version, ensure_snapshot, load_games,
+                      snapshot_version)
+from bgg.filters import FILTER_COLUMNS, sorted_index
+from bgg.leaderboards import METRICS, leaderboard
+from bgg.profile import dataset_profile
+from bgg.search import search_index
+from bgg.similar import similarity_index
+from bgg.tags import tag_incidence
+from bgg.trends import yearly_tag_share
+
+READY_PATH = os.path.join('static', 'ready.json')
+
+ENV_VAR = 'BGG_WARMUP'
+
+# Seconds between checks for a changed dataset once the caches are warm.
+WATCH_INTERVAL = 5
+
+logger = logging.getLogger('bgg.warmup')
+
+_lock = threading.Lock()
+_thread = None
+_status = {'state': 'idle', 'version': None, 'seconds': None, 'error': None}
+
+
+def warm_caches():
+    """Run every cached step the pages depend on, in dependency order."""
+    version = dataset_version()
+    load_games()
+    dataset_profile()
+    yearly_metrics()
+    for family in TAG_COLUMNS:
+        tag_incidence(family)
+        yearly_tag_share(family)
+    for column in FILTER_COLUMNS:
+        sorted_index(column)
+    for metric in METRICS:
+        leaderboard(metric)
+    search_index('name')
+    similarity_index()
+    # The strip plots are the only charts whose specs are slow to build, and
+    # the pages open with them not downsampled and with the default filters.
+    params = (None, STRIP_PLOT_START, MIN_USERS_RATED)
+    chart_spec('rating_strip_plot', lambda: yearly_strip_plot('average_rating', 'users_rated', 'Rating'), params)
+    chart_spec('weight_strip_plot', lambda: yearly_strip_plot('average_weight', 'total_weights', 'Rating'), params)
+    return version
+
+
+def _write_ready(version, seconds):
+    os.makedirs(os.path.dirname(READY_PATH), exist_ok=True)
+    tmp_path = f'{READY_PATH}.{os.getpid()}.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump({'version': list(version), 'seconds': seconds}, f)
+    os.replace(tmp_path, READY_PATH)
+
+
+def _clear_ready():
+    if os.path.exists(READY_PATH):
+        os.remove(READY_PATH)
+
+
+def _dataset_state():
+    """What the caches depend on: the CSV's mtime and the snapshot's version."""
+    csv_mtime = os.stat(DATA_PATH).st_mtime_ns if os.path.exists(DATA_PATH) else None
+    return csv_mtime, snapshot_version() if os.path.exists(SNAPSHOT_PATH) else None
+
+
+def _warm():
+    """Warm the caches, returning the dataset state they were warmed for."""
+    start = time.perf_counter()
+    state = _dataset_state()
+    try:
+        ensure_snapshot()
+        state = _dataset_state()
+        version = warm_caches()
+    except Exception as error:
+        logger.exception('Cache warm-up failed')
+        with _lock:
+            _status.update(state='failed', error=str(error))
+        return state
+    seconds = round(time.perf_counter() - start, 3)
+    _write_ready(version, seconds)
+    with _lock:
+        _status.update(state='ready', version=version, seconds=seconds, error=None)
+    logger.info('Caches warm in %.1fs', seconds)
+    return state
+
+
+def _run():
+    while True:
+        warmed = _warm()
+        while _dataset_state() == warmed:
+            time.sleep(WATCH_INTERVAL)
+        logger.info('Dataset changed, warming the caches again')
+        with _lock:
+            _clear_ready()
+            _status.update(state='warming', seconds=None, error=None)
+
+
+def start_warmup():
+    """Start warming and watching the caches, unless already started or turned off with BGG_WARMUP=0."""
+    global _thread
+    if os.environ.get(ENV_VAR) == '0':
+        return
+    with _lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _clear_ready()
+        _status.update(state='warming', seconds=None, error=None)
+        _thread = threading.Thread(target=_run, name='bgg-warmup', daemon=True)
+        _thread.start()
+
+
+def status():
+    """The warm-up state ('idle', 'warming', 'ready' or 'failed') and its details."""
+    with _lock:
+        return dict(_status)
+
+
+def readiness_indicator():
+    """Show in the sidebar whether the shared caches are warm yet."""
+    current = status()
+    if current['state'] == 'ready':
+        st.sidebar.caption(f"Caches warm, in {current['seconds']:.1f}s")
+    elif current['state'] == 'failed':
+        st.sidebar.warning(f"Cache warm-up failed: {current['error']}")
+    elif current['state'] == 'warming':
+        st.sidebar.caption('Warming caches...')
@@ -1,10 +1,10 @@
-import io
-import pandas as pd
 import streamlit as st
 
-from st_aggrid import GridOptionsBuilder, AgGrid, ColumnsAutoSizeMode
-
-df = pd.read_csv('board_games.csv')
+from bgg.data import load_games
+from bgg.filters import select_all
+from bgg.grid import paged_grid
+from bgg.instrument import begin_page, stage, timing_panel
+from bgg.profile import dataset_profile
 
 st.set_page_config(
     layout='wide',
@@ -12,21 +12,39 @@ st.set_page_config(
 
 st.sidebar.success('Select a page above.')
 
+begin_page('Data Exploration')
+
+st.sidebar.divider()
+
+long_minutes = st.sidebar.number_input('Long game, minutes', min_value=0, value=1440, step=60,
+                                       help='Playing time from which a game is listed as unusually long.')
+many_players = st.sidebar.number_input('Many players, over', min_value=0, value=10,
+                                       help='Max players above which a game is listed as unusually large.')
+
+with stage('load games') as record:
+    df = load_games(['id', 'name', 'yearpublished', 'minplayers', 'maxplayers', 'playingtime', 'minplaytime',
+                     'maxplaytime', 'categories'])
+    record['rows'] = len(df)
+with stage('profile'):
+    profile = dataset_profile()
+
 st.header("Data Exploration 🗺️")
 
 st.markdown("To start this project, as with any project, some initial data exploration is needed.")
 
-buffer = io.StringIO()
-df.info(buf=buffer)
-s = buffer.getvalue()
+st.text(profile['info'])
 
-st.text(s)
+st.caption('Null and distinct values per column (distinct tags for Mechanics and Categories)')
+st.write(profile['columns'])
 
 st.markdown("""First df.info() was run on the data and this is shown above. It shows there are some null values in 
             3 columns, but these three are ones that while are interesting to analyse, are not integral to the 
             initial work. Therefor I will not be dropping the rows with nulls in Categories, Mechanics or Designer.""")
 
-st.write(df.describe())
+st.write(profile['describe'])
+
+st.caption('Quantiles of the numeric columns')
+st.write(profile['quantiles'])
 
 st.markdown("""Next df.describe() was run on the data to ensure no columns have values that appear to be out of the 
             realm of acceptable. Ignoring the ID column, as this one is the ID assigned to the game by BGG, most 
@@ -38,19 +56,19 @@ st.markdown("""There are four that this does not apply to:
 - minplaytime and 
 - maxplayers.""")
 
+st.caption('Games outside the 1.5 x IQR fences')
+st.write(profile['outliers'])
+
 st.markdown("""Each of the play times columns appears to have a very large max value (60000-84000 minutes). While this 
             could be due to long campaign games; such as ISS Vanguard, Middara, Sword and Sorcery and the likes, this 
             does need looking at further just to sense check these numbers.""")
 
-df_size_check = df[(df['playingtime'] >= 1440)].copy()
-gb = GridOptionsBuilder.from_dataframe(df_size_check)
-gb.configure_pagination(enabled=True, paginationAutoPageSize=False, paginationPageSize=10)
-gb.configure_side_bar()
-gb.configure_default_column(groupable=True, value=True, enableRowGroup=True, aggFunc='sum', editable=True)
-gridOptions = gb.build()
-st.caption('Games over 24 hours long')
-AgGrid(df_size_check, gridOptions=gridOptions, columns_auto_size_mode=ColumnsAutoSizeMode.FIT_CONTENTS,
-       allow_unsafe_jscode=True)
+with stage('size check') as record:
+    df_size_check = df.iloc[select_all({'playingtime': (long_minutes, None)})]
+    record['rows'] = len(df_size_check)
+st.caption('Games over 24 hours long' if long_minutes == 1440 else f'Games {long_minutes} minutes long or more')
+paged_grid(df_size_check, 'size_check', columns=['id', 'name', 'yearpublished', 'playingtime', 'minplaytime',
+                                                  'maxplaytime', 'categories'])
 
 st.markdown("""Loading the above list, I was surprised to see very few long campaign games. Digging into the games I 
             could identify as long campaign, I searched BGG for them and it appears their playtime is measured by 
@@ -68,15 +86,12 @@ st.markdown("""The last column to investigate is the max players. Board games wi
             a exercise that would decend into chaos. So a table of games with more than 10 max players was created to
             investigate these games.""")
 
-df_players_check = df[(df['maxplayers'] > 10)].copy()
-gb = GridOptionsBuilder.from_dataframe(df_players_check)
-gb.configure_pagination(enabled=True, paginationAutoPageSize=False, paginationPageSize=10)
-gb.configure_side_bar()
-gb.configure_default_column(groupable=True, value=True, enableRowGroup=True, aggFunc='sum', editable=True)
-gridOptions1 = gb.build()
-st.caption('Games with over 10 max players')
-AgGrid(df_players_check, gridOptions=gridOptions1, columns_auto_size_mode=ColumnsAutoSizeMode.FIT_CONTENTS,
-       allow_unsafe_jscode=True)
+with stage('players check') as record:
+    df_players_check = df.iloc[select_all({'maxplayers': (many_players + 1, None)})]
+    record['rows'] = len(df_players_check)
+st.caption(f'Games with over {many_players} max players')
+paged_grid(df_players_check, 'players_check', columns=['id', 'name', 'yearpublished', 'minplayers', 'maxplayers',
+                                                        'categories'])
 
 st.markdown("""517 of the 863 games are tagged as party games in the categories. This shows how the max number of 
             players can be so high. The remaining 346 have a couple of tags in common, such as 'Word Games', 'Dice', 
@@ -85,3 +100,5 @@ st.markdown("""517 of the 863 games are tagged as party games in the categories.
 st.markdown("""With this initial data exploration complete, and all potentially erroneous data investigated, it
             is time to move onto visualizing the data to see what meaningful information can be pulled form this
             dataset.""")
+
+timing_panel()
@@ -1,10 +1,16 @@
-import pandas as pd
 import altair as alt
 import streamlit as st
 
-from st_aggrid import GridOptionsBuilder, AgGrid, ColumnsAutoSizeMode
+from st_aggrid import ColumnsAutoSizeMode
 
-df = pd.read_csv('board_games.csv')
+from bgg.aggregates import (MIN_USERS_RATED, tag_totals, voted_games, yearly_rating_means, yearly_releases,
+                            yearly_tags_per_game)
+from bgg.charts import STRIP_PLOT_SAMPLE, STRIP_PLOT_START, show_chart, yearly_strip_plot
+from bgg.filters import column_range, year_slider
+from bgg.grid import paged_grid
+from bgg.instrument import begin_page, stage, timing_panel
+from bgg.leaderboards import top_games, yearly_top_games
+from bgg.sections import lazy_section
 
 st.set_page_config(
     layout='wide',
@@ -12,6 +18,20 @@ st.set_page_config(
 
 st.sidebar.success('Select a page above.')
 
+begin_page('Data Visualization')
+
+st.sidebar.divider()
+
+downsample = st.sidebar.toggle('Downsample yearly strip plots',
+                               help=f'Plot at most {STRIP_PLOT_SAMPLE} randomly chosen games per year.')
+max_per_year = STRIP_PLOT_SAMPLE if downsample else None
+min_votes = st.sidebar.number_input('Minimum votes', min_value=1, value=MIN_USERS_RATED, step=10,
+                                    help='Ratings, or weight votes, a game needs to be shown in the yearly rankings.')
+strip_start = year_slider('Yearly rankings from', STRIP_PLOT_START)
+history_start = year_slider('Release history from', 1950,
+                            help='First year of the releases, mechanics and mechanics per game charts.')
+strip_params = (max_per_year, strip_start, min_votes)
+
 st.header("Data Visualization 📈")
 
 st.markdown("""Now that the initial data exploration has been done, and I'm happy with the results of it, it's time to
@@ -22,17 +42,23 @@ st.markdown("""Now that the initial data exploration has been done, and I'm happ
             board games such as Chess, Monopoly, Cluedo (Clue) etc, or do not register them as owned. Many sources cite 
             these as the most owned board games, so lets see what BGG believes to be the most owned:""")
 
-df_most_owners = df.sort_values('total_owners', ascending=False).head(50)
+
+def most_owned():
+    with stage('most owned') as record:
+        df_most_owners = top_games('total_owners', 50, columns=['name'])
+        record['rows'] = len(df_most_owners)
+
+    show_chart('most_owned', lambda: (
+        alt.Chart(df_most_owners).mark_bar().encode(
+            x=alt.X('name', sort='-y', title='Name'),
+            y=alt.Y('total_owners', title='Owner Count'),
+            color=alt.Color("name", legend=None),
+        )
+    ), width='stretch')
+
 
 st.subheader('Most owned BGG')
-chart = (
-    alt.Chart(df_most_owners).mark_bar().encode(
-        x=alt.X('name', sort='-y', title='Name'),
-        y=alt.Y('total_owners', title='Owner Count'),
-        color=alt.Color("name", legend=None),
-    )
-)
-st.altair_chart(chart, use_container_width=True)
+lazy_section('Most owned games', 'most_owned_section', most_owned, expanded=True)
 
 st.markdown("""So as I suspected, none of the 'Classic' games are included in the top 50. Yet articles such as 
             \[[1](https://www.fun.com/best-selling-board-games-all-time.html)\], 
@@ -42,22 +68,48 @@ st.markdown("""So as I suspected, none of the 'Classic' games are included in th
             only game from the top 50 on BGG that appears on these top Board Games sites is Catan. Comparative to the
             articles on top board games, where Catan appears quite far down most, it's the most popular on BGG.""")
 
+LEADERBOARDS = {'Most owned': 'total_owners', 'Top rated': 'average_rating', 'Heaviest': 'average_weight'}
+
+
+def leaderboards():
+    board_col, years_col, per_year_col = st.columns([2, 3, 1])
+    metric = LEADERBOARDS[board_col.selectbox('Leaderboard', list(LEADERBOARDS), key='leaderboard_metric')]
+    first_year, last_year = column_range('yearpublished')
+    start, end = years_col.slider('Released', first_year, last_year, (max(history_start, first_year), last_year),
+                                  key='leaderboard_years')
+    per_year = per_year_col.toggle('Per year', key='leaderboard_per_year')
+    with stage('leaderboard') as record:
+        if per_year:
+            leaders = yearly_top_games(metric, 5, start, end, min_votes)
+        else:
+            leaders = top_games(metric, 20, start, end, min_votes)
+        record['rows'] = len(leaders)
+    st.caption(f'Ranked among games with at least {min_votes} votes' if metric != 'total_owners' else
+               'Ranked by number of owners')
+    st.dataframe(leaders, hide_index=True, width='stretch')
+
+
+lazy_section('Leaderboards', 'leaderboards_section', leaderboards)
+
 st.markdown("""Next, I wanted to investigate whether numbers of board games released per year continued to increase, as
             seen by Dinesh Vatvani in 2018, or if there was a tipping point. """)
 
-yearly_release = df.groupby(['yearpublished']).size().reset_index(name='count')
-yearly_release = yearly_release.drop(yearly_release.index[-1])
-yearly_release['yearpublished'] = yearly_release['yearpublished'].astype(int)
-yearly_release_limited = yearly_release[(yearly_release['yearpublished'] >= 1950)].copy()
+
+def releases():
+    with stage('yearly releases') as record:
+        yearly_release_limited = yearly_releases().loc[history_start:].reset_index()
+        record['rows'] = len(yearly_release_limited)
+
+    show_chart('yearly_releases', lambda: (
+        alt.Chart(yearly_release_limited).mark_line(point=True).encode(
+            x=alt.X('yearpublished', title='Release Year'),
+            y=alt.Y('count', title='Count'),
+        )
+    ), params=(history_start,), width='stretch')
+
 
 st.subheader('Yearly Board Game Releases')
-chart = (
-    alt.Chart(yearly_release_limited).mark_line(point=True).encode(
-        x=alt.X('yearpublished', title='Release Year'),
-        y=alt.Y('count', title='Count'),
-    )
-)
-st.altair_chart(chart, use_container_width=True)
+lazy_section('Releases per year', 'yearly_releases_section', releases, expanded=True)
 
 st.markdown("""Having plotted the releases by year from 1950 onwards, we can see around the 1970s, there is a gradual
             increase in releases, which starts to pick up momentum. By 1990 we are starting to see the releases increase
@@ -94,85 +146,48 @@ company profits.""")
 
 st.markdown("""So, having looked at most popular (according to BGG) and releases/year... what's next?""")
 
-rating_year = df[['yearpublished', 'average_rating', 'users_rated', 'name']].copy()
-rating_year = rating_year[(rating_year['yearpublished'] != 'unknown')]
-rating_year['yearpublished'] = rating_year['yearpublished'].astype(int)
-rating_year = rating_year[(rating_year['yearpublished'] >= 1990)]
-enough_ratings = rating_year[(rating_year['users_rated'] >= 150)].copy()
-
 st.subheader('Yearly Rankings')
-
-stripplot = alt.Chart(enough_ratings).mark_circle(size=8).encode(
-    x=alt.X(
-        'jitter:Q',
-        title=None,
-        axis=alt.Axis(ticks=True, grid=False, labels=False),
-        scale=alt.Scale(),
-    ),
-    y=alt.Y('average_rating:Q', title='Rating'),
-    color=alt.Color('yearpublished:N', legend=None),
-).transform_calculate(
-    # Generate Gaussian jitter with a Box-Muller transform
-    jitter='sqrt(-2*log(random()))*cos(2*PI*random())'
-)
-meanplot = alt.Chart(enough_ratings).mark_point(size=30).encode(
-    y=alt.Y('mean(average_rating):Q'),
-    color=alt.value('#ffff99'),
-)
-fullplot = (stripplot+meanplot).properties(
-    width=27,
-).facet(
-    column=alt.Column(
-        'yearpublished', title=None,
-        header=alt.Header(
-            labelColor='white',
-            labelFontSize=12,
-            labelAngle=0,
-            titleOrient='top',
-            labelOrient='bottom',
-            labelAlign='center',
-            labelPadding=25,
-        ),
-    ),
-).configure_facet(
-    spacing=5
-).configure_view(
-    stroke=None
-)
-
-st.altair_chart(fullplot)
+lazy_section('Ratings per year', 'rating_strip_plot_section', lambda: show_chart(
+    'rating_strip_plot', lambda: yearly_strip_plot('average_rating', 'users_rated', 'Rating', *strip_params),
+    params=strip_params,
+))
 
 st.markdown("""Looking at this chart, we can see that every year more and more reviews are submitted for games (which
             is consistent with increased releases) but also as of 2019 on average games are rated over 7/10. This is 
             despite some significantly low rated games:""")
 
-low_rated = enough_ratings[(enough_ratings['average_rating'] <= 4) & (enough_ratings['yearpublished'] >= 2015)].copy()
-low_rated = low_rated.sort_values('yearpublished')
-
-mean_ratings = enough_ratings.groupby(['yearpublished']).mean(numeric_only=True).reset_index()
-mean_ratings = mean_ratings.drop('users_rated', axis=1)
-ratings = low_rated.merge(mean_ratings, on=['yearpublished'])
-ratings = ratings.rename(columns={'average_rating_x': 'game_average',
-                                  'average_rating_y': 'year_average'})
-ratings['difference'] = ratings['year_average'] - ratings['game_average']
-columnsTitles = ['yearpublished', 'users_rated', 'name', 'game_average', 'year_average', 'difference']
-ratings = ratings.reindex(columns=columnsTitles)
-ratings = ratings.rename(columns={'yearpublished': 'Publication Year',
-                                  'users_rated': 'Users Rated',
-                                  'name': 'Name',
-                                  'game_average': 'Game Rating',
-                                  'year_average': 'Yearly Average Rating',
-                                  'difference': 'Difference'})
-
-
-gb = GridOptionsBuilder.from_dataframe(ratings)
-gb.configure_pagination(enabled=True, paginationAutoPageSize=False, paginationPageSize=10)
-gb.configure_side_bar()
-gb.configure_default_column(groupable=True, value=True, enableRowGroup=True, aggFunc='sum', editable=True)
-gridOptions1 = gb.build()
-st.caption('Low Rated Games, Published After 2015')
-AgGrid(ratings, gridOptions=gridOptions1, columns_auto_size_mode=ColumnsAutoSizeMode.FIT_ALL_COLUMNS_TO_VIEW,
-       allow_unsafe_jscode=True)
+
+def low_rated_games():
+    with stage('low rated') as record:
+        enough_ratings = voted_games('average_rating', 'users_rated', strip_start, min_votes)
+        low_rated = enough_ratings[(enough_ratings['average_rating'] <= 4)
+                                   & (enough_ratings['yearpublished'] >= 2015)]
+        low_rated = low_rated.sort_values('yearpublished')
+
+        if min_votes == MIN_USERS_RATED:
+            mean_ratings = yearly_rating_means().reset_index()
+        else:
+            mean_ratings = enough_ratings.groupby('yearpublished')['average_rating'].mean().reset_index()
+        ratings = low_rated.merge(mean_ratings, on=['yearpublished'])
+        ratings = ratings.rename(columns={'average_rating_x': 'game_average',
+                                          'average_rating_y': 'year_average'})
+        ratings['difference'] = ratings['year_average'] - ratings['game_average']
+        columnsTitles = ['yearpublished', 'users_rated', 'name', 'game_average', 'year_average', 'difference']
+        ratings = ratings.reindex(columns=columnsTitles)
+        ratings = ratings.rename(columns={'yearpublished': 'Publication Year',
+                                          'users_rated': 'Users Rated',
+                                          'name': 'Name',
+                                          'game_average': 'Game Rating',
+                                          'year_average': 'Yearly Average Rating',
+                                          'difference': 'Difference'})
+        record['rows'] = len(ratings)
+
+    st.caption('Low Rated Games, Published After 2015')
+    paged_grid(ratings, 'low_rated', search_columns=['Name'],
+               columns_auto_size_mode=ColumnsAutoSizeMode.FIT_ALL_COLUMNS_TO_VIEW)
+
+
+lazy_section('Low rated games', 'low_rated_section', low_rated_games)
 
 st.markdown("""Without looking at further criteria for why these games are so low rated, it is hard to quantify the
             reasons behind it, however compared to the yearly average, these are very low rated games.""")
@@ -185,53 +200,11 @@ st.markdown("""Going back to the original graph, it does appear at face value ga
             solo? I believe many of these to be contributing factors to more people getting into boardgames and therefor
             discovering Board Game Geek and rating games.""")
 
-complexity = df[['yearpublished', 'average_weight', 'total_weights', 'name']].copy()
-complexity_year = complexity[(complexity['yearpublished'] != 'unknown')].copy()
-complexity_year['yearpublished'] = complexity_year['yearpublished'].astype(int)
-complexity_year = complexity_year[(complexity_year['yearpublished'] >= 1990)]
-enough_weights = complexity_year[(complexity_year['total_weights'] >= 150)].copy()
-# st.table(enough_weights)
 st.subheader('Yearly Weightings (Complexity)')
-
-stripplot = alt.Chart(enough_weights).mark_circle(size=8).encode(
-    x=alt.X(
-        'jitter:Q',
-        title=None,
-        axis=alt.Axis(ticks=True, grid=False, labels=False),
-        scale=alt.Scale(),
-    ),
-    y=alt.Y('average_weight:Q', title='Rating'),
-    color=alt.Color('yearpublished:N', legend=None),
-).transform_calculate(
-    # Generate Gaussian jitter with a Box-Muller transform
-    jitter='sqrt(-2*log(random()))*cos(2*PI*random())'
-)
-meanplot = alt.Chart(enough_weights).mark_point(size=30).encode(
-    y=alt.Y('mean(average_weight):Q'),
-    color=alt.value('#ffff99'),
-)
-fullplot = (stripplot+meanplot).properties(
-    width=27,
-).facet(
-    column=alt.Column(
-        'yearpublished', title=None,
-        header=alt.Header(
-            labelColor='white',
-            labelFontSize=12,
-            labelAngle=0,
-            titleOrient='top',
-            labelOrient='bottom',
-            labelAlign='center',
-            labelPadding=25,
-        ),
-    ),
-).configure_facet(
-    spacing=5
-).configure_view(
-    stroke=None
-)
-
-st.altair_chart(fullplot)
+lazy_section('Weights per year', 'weight_strip_plot_section', lambda: show_chart(
+    'weight_strip_plot', lambda: yearly_strip_plot('average_weight', 'total_weights', 'Rating', *strip_params),
+    params=strip_params,
+))
 
 st.markdown("""Is it that more complex games are prompting people to feel a greater sense of reward and enjoyment? Or 
             are simpler games popular? Time to take a look. The data for this has been limited to 1950 onwards, which is 
@@ -239,67 +212,52 @@ st.markdown("""Is it that more complex games are prompting people to feel a grea
             releases. A description of mechanics according to the BGG community can be found here: 
             \[[mechanisms](https://boardgamegeek.com/wiki/page/mechanism)\]""")
 
-df_mechanics = df[['yearpublished', 'mechanics']].copy()
-df_mechanics['mechanics'] = df_mechanics['mechanics'].str.replace('Deck, Bag, and Pool Building',
-                                                                  'Deck / Bag / Pool Building')
-df_mechanics['mechanics'] = df_mechanics['mechanics'].str.replace('Worker Placement, Different Worker Types',
-                                                                  'Worker Placement / Different Worker Types')
-df_mechanics['mechanics'] = df_mechanics['mechanics'].str.replace('I Cut, You Choose',
-                                                                  'I Cut / You Choose')
-df_mechanics['yearpublished'] = df_mechanics['yearpublished'].astype(int)
-df_mechanics = df_mechanics[(df_mechanics['yearpublished'] >= 1950)]
-df_mechanics['mechanics'] = df_mechanics['mechanics'].str.split(',')
-df_mechanics = df_mechanics.explode('mechanics')
-df_mechanics = df_mechanics.groupby(['mechanics'])['mechanics'].count().reset_index(name='Count')
-df_most_mechanics = df_mechanics.sort_values('Count', ascending=False).head(50)
 
-st.subheader('Most Popular Mechanics')
+def mechanics_popularity():
+    with stage('mechanics counts') as record:
+        df_mechanics = tag_totals('mechanics', start=history_start)
+        df_most_mechanics = df_mechanics.head(50)
+        record['rows'] = len(df_mechanics)
 
-chart = (
-    alt.Chart(df_most_mechanics).mark_bar().encode(
-        x=alt.X('Count'),
-        y=alt.Y('mechanics', sort='-x'),
-        color=alt.Color("mechanics", legend=None),
-    )
-)
-st.altair_chart(chart, use_container_width=True)
+    show_chart('mechanics_popularity', lambda: (
+        alt.Chart(df_most_mechanics).mark_bar().encode(
+            x=alt.X('Count'),
+            y=alt.Y('mechanics', sort='-x'),
+            color=alt.Color("mechanics", legend=None),
+        )
+    ), params=(history_start,), width='stretch')
+
+
+st.subheader('Most Popular Mechanics')
+lazy_section('Mechanics by number of games', 'mechanics_popularity_section', mechanics_popularity)
 
 st.markdown("""The top mechanics (Dice Rolling, and Roll or Spin to Move) are not inherently particularly complicated 
             mechanics. Hand Management and Set Collection are more so, but still individually not overly complex. This 
             has then lead to the question: 'Are the amount of mechanics in games becoming higher?' The chart below will 
             explore this question.""")
 
-df_mechanics_years = df[['yearpublished', 'name', 'mechanics']].copy()
-df_mechanics_years['mechanics'] = df_mechanics_years['mechanics'].str.replace('Deck, Bag, and Pool Building',
-                                                                              'Deck / Bag / Pool Building')
-df_mechanics_years['mechanics'] = df_mechanics_years['mechanics'].str.\
-    replace('Worker Placement, Different Worker Types',
-            'Worker Placement / Different Worker Types')
-df_mechanics_years['mechanics'] = df_mechanics_years['mechanics'].str.replace('I Cut, You Choose',
-                                                                              'I Cut / You Choose')
-df_mechanics_years['mechanics'] = df_mechanics_years['mechanics'].str.split(',')
-df_mechanics_years = df_mechanics_years.explode('mechanics')
-df_mechanics_years = df_mechanics_years.groupby(['yearpublished', 'name']).count().reset_index()
-df_mechanics_years = df_mechanics_years[(df_mechanics_years['yearpublished'] != 'unknown')]
-df_mechanics_years['yearpublished'] = df_mechanics_years['yearpublished'].astype(int)
-df_mechanics_years = df_mechanics_years[(df_mechanics_years['yearpublished'] >= 1950)
-                                        & (df_mechanics_years['yearpublished'] <= 2023)]
-df_mechanics_years = df_mechanics_years[(df_mechanics_years['mechanics'] > 0)]
-df_mechanics_years = df_mechanics_years.groupby(['yearpublished']).mean(numeric_only=True).reset_index()
 
-st.subheader('Average Number of Mechanics/Game')
+def mechanics_per_game():
+    with stage('mechanics per game') as record:
+        df_mechanics_years = yearly_tags_per_game('mechanics').loc[history_start:2023].reset_index()
+        record['rows'] = len(df_mechanics_years)
 
-chart = (
-    alt.Chart(df_mechanics_years).mark_circle().encode(
-        x=alt.X('yearpublished', title='Release Year', scale=alt.Scale(domain=[1950, 2024])),
-        y=alt.Y('mechanics', scale=alt.Scale(domain=[0, 6])),
-    )
-)
-st.altair_chart(chart, use_container_width=True)
+    show_chart('mechanics_per_game', lambda: (
+        alt.Chart(df_mechanics_years).mark_circle().encode(
+            x=alt.X('yearpublished', title='Release Year', scale=alt.Scale(domain=[history_start, 2024])),
+            y=alt.Y('mechanics', scale=alt.Scale(domain=[0, 6])),
+        )
+    ), params=(history_start,), width='stretch')
+
+
+st.subheader('Average Number of Mechanics/Game')
+lazy_section('Mechanics per game by year', 'mechanics_per_game_section', mechanics_per_game)
 
 st.markdown("""Until 2013 we remain at around a 2.5 average amount of mechanics per game. Not too high. After 2014 we 
             start to see the complexity creep begin, with a sharp rise seen 2019 onwards. This means that it does look
             like games are getting more complex, which was also shown by the complexity rating increasing also. With the
             increase in ratings, seen in 
-            \[[the weightings chart](/Part_2_-_Data_Visualization_%F0%9F%93%88#yearly-weightings-complexity)\] 
+            \[[the weightings chart](/Part_2_-_Data_Visualization_Part_1_%F0%9F%93%88#yearly-weightings-complexity)\] 
             it does appear people are starting to favour more complex games.""")
+
+timing_panel()
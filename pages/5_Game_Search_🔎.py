@@ -0,0 +1,56 @@
+import pandas as pd
+import streamlit as st
+
+from bgg.data import join_tags, load_games
+from bgg.instrument import begin_page, stage, timing_panel
+from bgg.search import search_games
+
+st.set_page_config(
+    layout='wide',
+)
+
+st.sidebar.success('Select a page above.')
+
+begin_page('Game Search')
+
+st.header("Game Search 🔎")
+
+st.markdown("""Look up a single game, for example one of the outliers found while exploring the data, by typing part of
+            its name or of its designer's. Near misses and typos still match.""")
+
+query_col, field_col = st.columns([4, 1])
+query = query_col.text_input('Search', key='search_query', placeholder='Game name')
+field = field_col.radio('Search in', ['name', 'designer'], format_func=str.title, horizontal=True,
+                        key='search_field')
+
+if query:
+    with stage('search') as record:
+        matches = search_games(query, field=field, columns=('name', 'yearpublished', 'designer'))
+        record['rows'] = len(matches)
+    if matches.empty:
+        st.caption('No games match.')
+    else:
+        choice = st.dataframe(matches.drop(columns=['row']), hide_index=True, width='stretch',
+                              on_select='rerun', selection_mode='single-row', key='search_results')
+        selected = choice.selection.rows[0] if choice.selection.rows else 0
+        # The selection outlives the query it was made on, and may be past the new matches.
+        if selected >= len(matches):
+            selected = 0
+
+        game = load_games().iloc[matches['row'].iloc[selected]]
+        year = 'unknown year' if pd.isna(game['yearpublished']) else game['yearpublished']
+        st.subheader(f"{game['name']} ({year})")
+        designer = 'an unknown designer' if pd.isna(game['designer']) else game['designer']
+        st.caption(f"BGG id {game['id']}, designed by {designer}")
+        stats = st.columns(6)
+        stats[0].metric('Players', f"{game['minplayers']}-{game['maxplayers']}")
+        stats[1].metric('Playing time', f"{game['playingtime']} min")
+        stats[2].metric('Rating', f"{game['average_rating']:.2f}", help=f"{game['users_rated']} ratings")
+        stats[3].metric('Weight', f"{game['average_weight']:.2f}", help=f"{game['total_weights']} weight votes")
+        stats[4].metric('Owners', f"{game['total_owners']:,}")
+        stats[5].metric('Play time range', f"{game['minplaytime']}-{game['maxplaytime']} min")
+        mechanics, categories = join_tags([game['mechanics'], game['categories']])
+        st.markdown(f"**Mechanics:** {(mechanics or 'none').replace(',', ', ')}")
+        st.markdown(f"**Categories:** {(categories or 'none').replace(',', ', ')}")
+
+timing_panel()
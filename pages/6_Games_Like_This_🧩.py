@@ -0,0 +1,60 @@
+import pandas as pd
+import streamlit as st
+
+from bgg.data import join_tags, load_games
+from bgg.instrument import begin_page, stage, timing_panel
+from bgg.search import search_games
+from bgg.similar import similar_games
+
+st.set_page_config(
+    layout='wide',
+)
+
+st.sidebar.success('Select a page above.')
+
+begin_page('Games Like This')
+
+st.header("Games Like This 🧩")
+
+st.markdown("""The mechanics and categories of a game say a lot about how it plays. Pick a game to find the games
+            sharing the most with it, with rarer mechanics and themes counting for more than common ones such as Dice
+            Rolling or Card Game.""")
+
+query_col, count_col, weight_col = st.columns([4, 1, 1])
+query = query_col.text_input('Game', key='similar_query', placeholder='Game name')
+count = count_col.number_input('Games to show', min_value=1, max_value=100, value=10, key='similar_count')
+match_weight = weight_col.toggle('Similar weight', key='similar_weight',
+                                 help='Favour games whose complexity rating is close to the chosen game.')
+
+
+def game_label(game):
+    year = 'unknown year' if pd.isna(game['yearpublished']) else game['yearpublished']
+    return f"{game['name']} ({year})"
+
+
+if query:
+    matches = search_games(query, limit=10)
+    if matches.empty:
+        st.caption('No games match.')
+    else:
+        row = st.selectbox('Matching games', matches['row'], key='similar_game',
+                           format_func=lambda row: game_label(matches.set_index('row').loc[row]))
+
+        with stage('similar games') as record:
+            similar = similar_games(row, count, match_weight)
+            tags = load_games(['mechanics', 'categories']).iloc[similar['row']]
+            similar['mechanics'] = join_tags(tags['mechanics'])
+            similar['categories'] = join_tags(tags['categories'])
+            record['rows'] = len(similar)
+
+        chosen = load_games(['name', 'yearpublished', 'mechanics', 'categories']).iloc[row]
+        st.subheader(f'Games like {game_label(chosen)}')
+        mechanics, categories = join_tags([chosen['mechanics'], chosen['categories']])
+        st.caption(f"Mechanics: {(mechanics or 'none').replace(',', ', ')}. "
+                   f"Categories: {(categories or 'none').replace(',', ', ')}.")
+        if similar.empty:
+            st.caption('No other game shares a mechanic or category with it.')
+        else:
+            st.dataframe(similar.drop(columns=['row']), hide_index=True, width='stretch')
+
+timing_panel()
@@ -0,0 +1,68 @@
+"""The incrementally maintained aggregates must always equal a full rebuild."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from bgg.aggregates import COLUMNS, combine, contributions, read_aggregates, write_aggregates
+from bgg.data import build_snapshot, read_csv, snapshot_version, write_snapshot
+from bgg.ingest import ingest
+from bgg.refresh import apply_delta, scrape_delta
+from bgg.synthetic import synthetic_games
+
+
+def full_rebuild(games):
+    return combine(contributions(games[COLUMNS]))
+
+
+def assert_same_aggregates(actual, expected):
+    keys = ['aggregate', 'yearpublished', 'key']
+    actual = actual.sort_values(keys, ignore_index=True)
+    expected = expected.sort_values(keys, ignore_index=True)
+    pd.testing.assert_frame_equal(actual[keys], expected[keys])
+    np.testing.assert_allclose(actual['value'], expected['value'], rtol=1e-12)
+
+
+@pytest.fixture
+def scrape(tmp_path):
+    path = tmp_path / 'board_games.csv'
+    synthetic_games(2000).to_csv(path, index=False)
+    return path
+
+
+def test_apply_delta_matches_full_rebuild(scrape, tmp_path):
+    snapshot_path, aggregates_path = tmp_path / 'games.parquet', tmp_path / 'aggregates.parquet'
+    build_snapshot(scrape, snapshot_path)
+    snapshot = pd.read_parquet(snapshot_path)
+    write_aggregates(full_rebuild(snapshot), snapshot_version(snapshot_path), aggregates_path)
+
+    # A re-scrape with updated ratings and tags, removed games and new ones.
+    rescrape = pd.read_csv(scrape)
+    updated = rescrape.index[::40]
+    rescrape.loc[updated, 'average_rating'] = 9.5
+    rescrape.loc[updated, 'users_rated'] += 500
+    rescrape.loc[updated[::2], 'mechanics'] = 'Dice Rolling,Set Collection'
+    rescrape = rescrape.drop(rescrape.index[5::70])
+    added = synthetic_games(100, seed=1)
+    added['id'] += rescrape['id'].max()
+    rescrape_path = tmp_path / 'rescrape.csv'
+    pd.concat([rescrape, added]).to_csv(rescrape_path, index=False)
+
+    upserts, deleted = scrape_delta(snapshot, read_csv(rescrape_path))
+    assert deleted and len(upserts) > len(added)
+    apply_delta(upserts, deleted, snapshot_path, aggregates_path)
+
+    stored = read_aggregates(snapshot_version(snapshot_path), aggregates_path)
+    assert stored is not None
+    assert_same_aggregates(stored, full_rebuild(read_csv(rescrape_path)))
+
+
+def test_ingest_matches_full_rebuild(scrape, tmp_path):
+    snapshot_path, aggregates_path = tmp_path / 'games.parquet', tmp_path / 'aggregates.parquet'
+    assert ingest(scrape, snapshot_path, aggregates_path, batch_rows=300) == 2000
+
+    games = read_csv(scrape)
+    stored = read_aggregates(snapshot_version(snapshot_path), aggregates_path)
+    assert stored is not None
+    assert_same_aggregates(stored, full_rebuild(games))
+    whole_path = write_snapshot(games, tmp_path / 'whole.parquet')
+    pd.testing.assert_frame_equal(pd.read_parquet(snapshot_path), pd.read_parquet(whole_path))
@@ -0,0 +1,50 @@
+"""Leaderboard queries must give the same games as a full sort, ties going to the earlier row."""
+import pytest
+
+from bgg.data import DATA_PATH, load_games
+from bgg.leaderboards import LEADERBOARD_SIZE, METRICS, top_games, yearly_top_games
+from bgg.synthetic import synthetic_games
+
+MIN_VOTES = 5
+
+YEAR_RANGES = [(None, None), (1990, 2010), (2015, 2015)]
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    games = synthetic_games(5000)
+    # Coarse values, so that many games tie at every leaderboard's cut-off.
+    games['total_owners'] = games['total_owners'] // 10 * 10
+    games['average_rating'] = games['average_rating'].round(1)
+    games['average_weight'] = games['average_weight'].round(1)
+    games.to_csv(DATA_PATH, index=False)
+
+
+def full_ranking(metric, start=None, end=None):
+    """Every eligible game of the range, by a stable sort on the whole frame."""
+    games = load_games(['id', 'yearpublished', metric, 'users_rated', 'total_weights'])
+    votes = METRICS[metric]
+    games = games[games[metric].notna()]
+    if votes:
+        games = games[games[votes] >= MIN_VOTES]
+    if start is not None or end is not None:
+        games = games[(games['yearpublished'] >= start) & (games['yearpublished'] <= end)]
+    return games.sort_values(metric, ascending=False, kind='stable')
+
+
+@pytest.mark.parametrize('metric', list(METRICS))
+@pytest.mark.parametrize('start, end', YEAR_RANGES)
+@pytest.mark.parametrize('n', [20, LEADERBOARD_SIZE])
+def test_top_games_matches_full_sort(dataset, metric, start, end, n):
+    found = top_games(metric, n, start, end, MIN_VOTES, columns=('id',))
+    assert found['id'].tolist() == full_ranking(metric, start, end)['id'].head(n).tolist()
+
+
+@pytest.mark.parametrize('metric', list(METRICS))
+@pytest.mark.parametrize('n', [5, LEADERBOARD_SIZE])
+def test_yearly_top_games_matches_full_sort(dataset, metric, n):
+    found = yearly_top_games(metric, n, 1990, 2010, MIN_VOTES, columns=('id',))
+    ranked = full_ranking(metric, 1990, 2010)
+    expected = ranked.groupby('yearpublished', sort=True).head(n).sort_values('yearpublished', kind='stable')
+    assert found['id'].tolist() == expected['id'].tolist()
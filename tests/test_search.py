@@ -0,0 +1,29 @@
+"""Search results must be the best matches, with ties going to the most owned games."""
+import pytest
+
+from bgg.data import DATA_PATH, load_games
+from bgg.search import search_games, trigrams
+from bgg.synthetic import synthetic_games
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    synthetic_games(5000).to_csv(DATA_PATH, index=False)
+
+
+@pytest.mark.parametrize('query', ['empire dragon', 'dragon', 'quets', 'la'])
+def test_search_matches_full_ranking(dataset, query):
+    games = load_games(['name', 'total_owners'])
+    wanted = trigrams(query, partial=True)
+    ranked = []
+    for name, owners in zip(games['name'], games['total_owners']):
+        grams = trigrams(name)
+        shared = len(grams & wanted)
+        if shared:
+            ranked.append((-shared / len(grams | wanted), -owners))
+    ranked.sort()
+
+    found = search_games(query, limit=10, columns=('name', 'total_owners'))
+    assert list(zip(found['score'], found['total_owners'])) == [(round(-score, 3), -owners)
+                                                                 for score, owners in ranked[:10]]